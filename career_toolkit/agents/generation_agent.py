@@ -2,14 +2,18 @@ import os
 import json
 import warnings
 import asyncio
+import copy
 import concurrent.futures
 import hashlib
 import re
+import threading
+import time
+from collections import OrderedDict
 from functools import lru_cache
 from sentence_transformers import SentenceTransformer, util
 from .data_agent import Resume, JobDescription
 from pydantic import HttpUrl
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from openai import OpenAI
 
 # Shared constants to keep prompts consistent
@@ -65,45 +69,215 @@ JD_SCHEMA_FIELDS_V1 = (
     "skills[]: array of objects {name, level, keywords[]}"
 )
 
+# Fields the enrichment pass can infer from the text; date, salary and location are only
+# copied when stated, so their absence alone doesn't justify a second LLM call
+JD_INFERABLE_FIELDS_V1 = (
+    "title", "company", "type", "description", "remote", "experience",
+    "responsibilities", "qualifications", "skills",
+)
+
+SYSTEM_PROMPT = "You are an expert career assistant. Provide precise, structured responses."
+
+# Disk-backed prompt -> completion cache shared across sessions and restarts
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", ".cache/openai")
+LLM_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+# Responses kept in memory in front of the disk cache, most recently used last
+LLM_MEMORY_CACHE_SIZE = 256
+# The OpenAI client retries 429s, 5xx and connection errors itself with jittered exponential
+# backoff that honors Retry-After; its default of 2 retries gives up too early under rate limits
+OPENAI_MAX_RETRIES = 5
+
+# Summary instructions shared by blueprint_step_3_summary and generate_jd_bundle, so both produce the same quality
+SUMMARY_WRITING_GUIDELINES = """<writing_framework>
+1. Lead with years of experience and core expertise area
+2. Highlight 2-3 quantified achievements that align with job requirements
+3. Include 3-4 high-priority keywords naturally
+4. End with value proposition statement
+</writing_framework>
+
+<style_guidelines>
+- Use active voice and strong action verbs
+- Include specific metrics where possible
+- Maintain professional, confident tone
+- Keep to 3-4 impactful sentences
+- Optimize for both human readers and ATS
+</style_guidelines>"""
+
+
 class GenerationAgent:
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, model_name: str = None):
         """
         Initializes the GenerationAgent with an OpenAI API key.
         The API key is required for all generation tasks.
+        model_name falls back to the OPENAI_MODEL environment variable.
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key not provided. Please set it as an environment variable 'OPENAI_API_KEY'.")
-        # Ensure the SDK can find the API key and initialize a client
-        os.environ["OPENAI_API_KEY"] = self.api_key
-        self.client = OpenAI()
-        # Allow overriding via env, but restrict to allowed models only
+        # Hand the key to this client directly so agents built for different keys don't share global state
+        self.client = OpenAI(api_key=self.api_key, max_retries=OPENAI_MAX_RETRIES)
+        # Restrict to allowed models only
         allowed_models = {"gpt-4o-mini", "gpt-5"}
-        env_model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-        self.model_name = env_model if env_model in allowed_models else "gpt-4o-mini"
+        requested_model = model_name or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+        self.model_name = requested_model if requested_model in allowed_models else "gpt-4o-mini"
         # Per policy: use the same selected model for all tasks
         self.fast_model = self.model_name
         self.premium_model = self.model_name
         # Simple in-memory cache for job descriptions
         self._job_cache = {}
+        # Disk cache for LLM responses; switched off per session or per call through with_cache()
+        self.cache_enabled = True
+        self.cache_dir = LLM_CACHE_DIR
+        # key -> (created, response); repeats within a session skip the disk read and JSON parse
+        self._memory_cache = OrderedDict()
+        # Pool threads and sessions share the LRU; get/move_to_end/popitem must not interleave
+        self._memory_cache_lock = threading.Lock()
         # Initialize sentence transformer for semantic analysis
         self.semantic_model = SentenceTransformer('all-MiniLM-L6-v2')
 
-    def _call_llm(self, prompt: str, temperature: float = 0.5, max_tokens: int = 1500, model_override: str = None, json_mode: bool = False) -> str:
+    def with_cache(self, enabled: bool) -> "GenerationAgent":
+        """A view of this agent with its own cache setting; the client, model and caches stay shared.
+
+        The agent is shared by every session, so callers never flip cache_enabled on it directly.
+        """
+        if enabled == self.cache_enabled:
+            return self
+        view = copy.copy(self)
+        view.cache_enabled = enabled
+        return view
+
+    def uncached(self) -> "GenerationAgent":
+        """A view that skips the response cache, e.g. when the user asks to regenerate."""
+        return self.with_cache(False)
+
+    def _cache_key(self, *parts) -> str:
+        """Stable key for a request; hash() is salted per process so it can't be used on disk."""
+        return hashlib.blake2b(json.dumps(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Returns a cached response if present and not expired."""
+        with self._memory_cache_lock:
+            hit = self._memory_cache.get(key)
+            if hit is not None:
+                self._memory_cache.move_to_end(key)
+        if hit is None:
+            try:
+                with open(os.path.join(self.cache_dir, f"{key}.json"), "r") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                return None
+            hit = (entry.get("created", 0), entry.get("response"))
+            self._remember(key, hit)
+        created, response = hit
+        if time.time() - created > LLM_CACHE_TTL_SECONDS:
+            return None
+        return response
+
+    def _remember(self, key: str, hit: tuple):
+        """Adds an entry to the in-memory layer, evicting the least recently used one."""
+        with self._memory_cache_lock:
+            self._memory_cache[key] = hit
+            self._memory_cache.move_to_end(key)
+            if len(self._memory_cache) > LLM_MEMORY_CACHE_SIZE:
+                self._memory_cache.popitem(last=False)
+
+    def _cache_set(self, key: str, response: str):
+        """Stores a response; cache failures never break generation."""
+        self._remember(key, (time.time(), response))
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Pool threads can write the same key at once, so each writer gets its own temp file
+            tmp_path = os.path.join(self.cache_dir, f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"created": time.time(), "response": response}, f)
+            os.replace(tmp_path, os.path.join(self.cache_dir, f"{key}.json"))
+        except OSError as e:
+            print(f"Could not write LLM cache entry: {e}")
+
+    def _llm_cache_key(self, prompt: str, temperature: float, max_tokens: int, model: str, json_mode: bool) -> str:
+        """Cache key of a _call_llm request, for callers that store the response themselves."""
+        return self._cache_key(model, SYSTEM_PROMPT, prompt, temperature, max_tokens, json_mode)
+
+    def _call_llm(self, prompt: str, temperature: float = 0.5, max_tokens: int = 1500, model_override: str = None, json_mode: bool = False, use_cache: Optional[bool] = None, cache_result: bool = True) -> str:
         """
         Private method to handle calls to OpenAI API with automatic fallback.
+        Identical requests are served from the disk cache unless use_cache (default: cache_enabled) is False.
         json_mode: If True, forces JSON response format (only works with compatible models)
+        cache_result: False for callers that validate the response first and cache it themselves
+        """
+        selected_model = model_override or self.model_name
+        key = self._llm_cache_key(prompt, temperature, max_tokens, selected_model, json_mode)
+        if self.cache_enabled if use_cache is None else use_cache:
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+
+        response = self._request_completion(prompt, temperature, max_tokens, selected_model, json_mode)
+        # Never cache failures so the next attempt hits the API again
+        if cache_result and response and not response.startswith("Error:"):
+            self._cache_set(key, response)
+        return response
+
+    def _cache_validated(self, key: str, response: str):
+        """Stores a response that its caller has parsed successfully, skipping the write on a cache hit."""
+        if self._cache_get(key) != response:
+            self._cache_set(key, response)
+
+    def _stream_llm(self, prompt: str, temperature: float = 0.5, max_tokens: int = 1500, use_cache: Optional[bool] = None) -> Iterator[str]:
         """
+        Like _call_llm, but yields the response text in pieces as it arrives, for st.write_stream.
+        Shares _call_llm's cache entries; cache hits and GPT-5 (Responses API) come back as one piece.
+        """
+        if use_cache is None:
+            use_cache = self.cache_enabled
+        selected_model = self.model_name
+        if selected_model == "gpt-5":
+            yield self._call_llm(prompt, temperature, max_tokens, use_cache=use_cache)
+            return
+
+        key = self._cache_key(selected_model, SYSTEM_PROMPT, prompt, temperature, max_tokens, False)
+        if use_cache:
+            cached = self._cache_get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        chunks = []
+        try:
+            stream = self.client.chat.completions.create(
+                model=selected_model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            for event in stream:
+                delta = event.choices[0].delta.content if event.choices else None
+                if delta:
+                    chunks.append(delta)
+                    yield delta
+        except Exception as e:
+            print(f"An error occurred while streaming from the OpenAI API: {e}")
+            yield f"Error: Could not connect to the generation service. Details: {e}"
+            return
+
+        response = "".join(chunks).strip()
+        if response:
+            self._cache_set(key, response)
+
+    def _request_completion(self, prompt: str, temperature: float, max_tokens: int, selected_model: str, json_mode: bool) -> str:
+        """Sends a single request to the OpenAI API, preferring the Responses API for GPT-5."""
         try:
-            # Decide target model once and route accordingly
-            selected_model = model_override or self.model_name
             # Use Responses API only for GPT-5 with medium reasoning
             if selected_model == "gpt-5":
                 try:
                     kwargs = {
                         "model": selected_model,
                         "input": [
-                            {"role": "system", "content": "You are an expert career assistant. Provide precise, structured responses."},
+                            {"role": "system", "content": SYSTEM_PROMPT},
                             {"role": "user", "content": prompt},
                         ],
                         "max_output_tokens": max_tokens,
@@ -124,7 +298,7 @@ class GenerationAgent:
             kwargs = {
                 "model": selected_model,
                 "messages": [
-                    {"role": "system", "content": "You are an expert career assistant. Provide precise, structured responses."},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 "temperature": temperature,
@@ -215,8 +389,10 @@ class GenerationAgent:
 
 Return only the condensed text with all critical information preserved.
         """
-        # Optimized settings for information preservation
-        return self._call_llm(prompt, temperature=0.1, max_tokens=2000)
+        # Optimized settings for information preservation. The bounded response cache lets structuring
+        # and enrichment of one JD share a single summary; condensing is preprocessing, so it is
+        # cached even when the session bypasses the cache for fresh answers
+        return self._call_llm(prompt, temperature=0.1, max_tokens=2000, use_cache=True)
 
     def extract_job_details(self, raw_text: str) -> Dict:
         """
@@ -426,6 +602,10 @@ Return ONLY valid JSON for the object (no markdown, no comments, no explanations
         # Ensure we have a base structure to merge into
         base = self.structure_job_description_schema_v1(raw_text) if not isinstance(structured, dict) else structured.copy()
 
+        # The structuring prompt already infers what it can; skip the round-trip when nothing is left to fill
+        if base and all(base.get(field) for field in JD_INFERABLE_FIELDS_V1):
+            return base
+
         processed_text = self._summarize_if_needed(raw_text, context="job description")
         prompt = f"""
 You are an expert Job Description parser. Given a partially structured Job Description object and the original job description text,
@@ -525,9 +705,23 @@ skills[]: array of objects {{name, level, keywords[]}}
 
         return merged
 
+    def _application_context(self, resume: Resume, job_description: JobDescription) -> str:
+        """
+        Resume and JD block that opens every prompt built from both, byte-identical across methods,
+        so OpenAI's automatic prompt caching can reuse the prefix between them.
+        """
+        return f"""<resume_data>
+{resume.model_dump_json(indent=2)}
+</resume_data>
+
+<job_requirements>
+{job_description.model_dump_json(indent=2)}
+</job_requirements>
+"""
+
     def _analyze_for_cover_letter(self, resume: Resume, job_description: JobDescription) -> dict:
         """Analyzes the resume and job description to extract key themes and evidence for the cover letter."""
-        prompt = f"""
+        prompt = f"""{self._application_context(resume, job_description)}
 <role>Senior Career Strategist specializing in executive-level positioning and narrative development</role>
 
 <objective>Identify the 3 strongest alignment points between candidate experience and job requirements</objective>
@@ -538,14 +732,6 @@ skills[]: array of objects {{name, level, keywords[]}}
 3. Prioritize achievements with specific metrics, outcomes, or business impact
 </methodology>
 
-<resume_data>
-{resume.model_dump_json(indent=2)}
-</resume_data>
-
-<job_requirements>
-{job_description.model_dump_json(indent=2)}
-</job_requirements>
-
 <output_format>
 {{
   "story_points": [
@@ -561,15 +747,57 @@ skills[]: array of objects {{name, level, keywords[]}}
         """
         return self._call_llm_with_json_retry(prompt, model_override=self.fast_model)
 
-    def generate_cover_letter(self, resume: Resume, job_description: JobDescription, recipient_name: str) -> str:
+    def generate_jd_bundle(self, resume: Resume, job_description: JobDescription) -> Dict:
         """
-        Generates a personalized cover letter based on the resume, job description, and a new strategic prompt.
+        Produces the per-job artifacts (rewritten summary, cover-letter outline) in a single call.
+        Returns {"summary": str, "cover_letter_outline": {"story_points": [...]}}.
         """
-        resume_json = resume.model_dump_json(indent=2)
-        job_description_json = job_description.model_dump_json(indent=2)
+        prompt = f"""{self._application_context(resume, job_description)}
+<role>Senior Career Strategist and Executive Resume Writer</role>
 
-        # Step 1: Perform the analysis to get the story points.
-        story_points_data = self._analyze_for_cover_letter(resume, job_description)
+<task>Produce every tailoring artifact for this application in one pass</task>
+
+<artifacts>
+1. summary: Rewritten professional summary (3-4 sentences) that leads with experience, cites 2-3 quantified achievements and weaves in high-priority keywords
+2. cover_letter_outline: The 3 strongest alignment points, each pairing a job requirement theme with quantified resume evidence
+</artifacts>
+
+{SUMMARY_WRITING_GUIDELINES}
+
+<output_format>
+{{
+  "summary": "Rewritten professional summary",
+  "cover_letter_outline": [
+    {{
+      "theme": "Primary job requirement or skill area",
+      "evidence": "Specific quantified achievement from resume with metrics"
+    }}
+  ]
+}}
+</output_format>
+
+Return only the JSON object.
+        """
+        resp = self._call_llm_with_json_retry(prompt, temperature=0.3, max_tokens=1500, model_override=self.fast_model)
+        if not isinstance(resp, dict):
+            return {"error": "Failed to generate job bundle."}
+        if 'error' in resp:
+            return {"error": resp['error']}
+
+        outline = resp.get("cover_letter_outline")
+        story_points = [p for p in outline if isinstance(p, dict)] if isinstance(outline, list) else []
+        return {
+            "summary": str(resp.get("summary") or "").strip(),
+            "cover_letter_outline": {"story_points": story_points},
+        }
+
+    def generate_cover_letter(self, resume: Resume, job_description: JobDescription, recipient_name: str, story_points: Optional[Dict] = None) -> str:
+        """
+        Generates a personalized cover letter based on the resume, job description, and a new strategic prompt.
+        Pass story_points (e.g. the cover_letter_outline from generate_jd_bundle()) to skip the analysis call.
+        """
+        # Step 1: Perform the analysis to get the story points, unless already available.
+        story_points_data = story_points if story_points and story_points.get('story_points') else self._analyze_for_cover_letter(resume, job_description)
         if 'error' in story_points_data:
             return f"Error during analysis phase: {story_points_data['error']}"
 
@@ -617,6 +845,14 @@ Generate only the cover letter body text. No salutation or signature.
         Generates a comprehensive alignment report in Markdown.
         structured_jd should follow the v1 schema (title/company/type/date/description/location/remote/salary/experience/responsibilities/qualifications/skills[]).
         """
+        return self._call_llm(self._alignment_report_prompt(resume, structured_jd), temperature=0.3, max_tokens=1200)
+
+    def generate_alignment_report_markdown_stream(self, resume: Resume, structured_jd: Dict) -> Iterator[str]:
+        """Streaming variant of generate_alignment_report_markdown; yields the Markdown as it is generated."""
+        return self._stream_llm(self._alignment_report_prompt(resume, structured_jd), temperature=0.3, max_tokens=1200)
+
+    def _alignment_report_prompt(self, resume: Resume, structured_jd: Dict) -> str:
+        """Builds the alignment report prompt shared by the blocking and streaming variants."""
         # Build minimal safe structured JD snippet for the prompt
         sjd = structured_jd or {}
         try:
@@ -673,7 +909,7 @@ Rules:
 
 Return ONLY the Markdown content.
 """
-        return self._call_llm(prompt, temperature=0.3, max_tokens=1200)
+        return prompt
 
     def _call_llm_with_json_retry(self, prompt: str, max_retries=4, temperature: float = 0.2, max_tokens: int = 2000, model_override: str = None) -> dict:
         """Calls the LLM with robust JSON parsing and retry logic."""
@@ -683,11 +919,14 @@ Return ONLY the Markdown content.
 CRITICAL: Your response must be ONLY valid JSON. No explanations, no markdown, no code blocks.
 Start your response with {{ and end with }}"""
         
+        # Only a response that parses is cached, and under the first attempt's key, so a later
+        # call either replays good JSON or asks the API again; retries are never cached
+        first_key = self._llm_cache_key(json_prompt, temperature, max_tokens, model_override or self.model_name, True)
         last_response = ""
         for attempt in range(max_retries):
             # Use JSON mode on first attempt for compatible models
             use_json_mode = (attempt == 0)
-            response_str = self._call_llm(json_prompt, temperature=temperature, max_tokens=max_tokens, model_override=model_override, json_mode=use_json_mode)
+            response_str = self._call_llm(json_prompt, temperature=temperature, max_tokens=max_tokens, model_override=model_override, json_mode=use_json_mode, cache_result=False)
             last_response = response_str
             
             # Skip if we got an error from the API
@@ -709,6 +948,7 @@ Start your response with {{ and end with }}"""
                     result = strategy(response_str)
                     if result and isinstance(result, dict):
                         print(f"Success with {strategy_name} strategy on attempt {attempt + 1}")
+                        self._cache_validated(first_key, response_str)
                         return result
                 except Exception as e:
                     print(f"{strategy_name} strategy failed: {e}")
@@ -912,20 +1152,7 @@ REQUIRED JSON FORMAT (respond with ONLY this JSON, no other text):
 {job_description.skills}
 </key_skills_to_integrate>
 
-<writing_framework>
-1. Lead with years of experience and core expertise area
-2. Highlight 2-3 quantified achievements that align with job requirements
-3. Include 3-4 high-priority keywords naturally
-4. End with value proposition statement
-</writing_framework>
-
-<style_guidelines>
-- Use active voice and strong action verbs
-- Include specific metrics where possible
-- Maintain professional, confident tone
-- Keep to 3-4 impactful sentences
-- Optimize for both human readers and ATS
-</style_guidelines>
+{SUMMARY_WRITING_GUIDELINES}
 
 Return only the rewritten professional summary text.
         """
@@ -1006,6 +1233,93 @@ Return only the JSON object.
             }
         return safe
 
+    def blueprint_step_4_achievements_batch(self, items: List[Tuple[str, str]], job_description: JobDescription) -> List[Dict]:
+        """Rewrites several (highlight, work_title) pairs in one call; returns one result per item, in order.
+
+        Items the model skips or garbles are retried one at a time with blueprint_step_4_achievements.
+        The bullets come last so concurrent batches for one job share the JD and instruction prefix,
+        which OpenAI's automatic prompt caching bills at a discount.
+        """
+        numbered = "\n".join(
+            f"{n}. {highlight} (role: {work_title})" for n, (highlight, work_title) in enumerate(items, start=1)
+        )
+        prompt = f"""
+<role>Senior Resume Optimization Specialist with expertise in achievement-based positioning</role>
+
+<task>Transform each numbered resume bullet point using STAR-D methodology for maximum impact</task>
+
+<target_job_context>
+{job_description.responsibilities + job_description.qualifications}
+</target_job_context>
+
+<star_d_framework>
+- Situation: Brief context or challenge
+- Task: Specific responsibility or objective
+- Action: What you did (use strong action verbs)
+- Result: Quantified outcome or impact
+- Detail: Additional context that adds credibility
+</star_d_framework>
+
+<optimization_rules>
+1. Start with strong action verb
+2. Include specific metrics (create realistic placeholders if needed)
+3. Show business impact, not just activities
+4. Use keywords from target job description
+5. Keep under 2 lines for readability
+</optimization_rules>
+
+<placeholder_guidance>
+If metrics are missing, create realistic placeholders in brackets:
+- "[~15-20%]" for percentage improvements
+- "[approx. $250K]" for budget/revenue figures
+- "[25+ team members]" for team sizes
+</placeholder_guidance>
+
+<output_format>
+{{
+  "results": [
+    {{
+      "index": 1,
+      "original_bullet": "Original text",
+      "optimized_bullet": "STAR-D optimized version",
+      "rationale": "Brief explanation of changes and impact"
+    }}
+  ]
+}}
+</output_format>
+
+<original_bullets>
+{numbered}
+</original_bullets>
+
+Return only the JSON object, with one entry in "results" for every numbered bullet.
+        """
+        resp = self._call_llm_with_json_retry(prompt, max_tokens=min(4000, 400 * len(items)))
+        by_index = {}
+        if isinstance(resp, dict) and isinstance(resp.get("results"), list):
+            for entry in resp["results"]:
+                if not isinstance(entry, dict) or not entry.get("optimized_bullet"):
+                    continue
+                # Models often quote the index ("1"); only entries that can't be read as a number are skipped
+                try:
+                    by_index[int(entry.get("index"))] = entry
+                except (TypeError, ValueError):
+                    continue
+
+        results = []
+        for n, (highlight, work_title) in enumerate(items, start=1):
+            entry = by_index.get(n)
+            if entry is None:
+                # Bad or missing index in the batch answer; fall back to the single-bullet prompt
+                results.append(self.blueprint_step_4_achievements(highlight, work_title, job_description))
+                continue
+            results.append({
+                "original_bullet": entry.get("original_bullet") or highlight,
+                "optimized_bullet": entry.get("optimized_bullet") or highlight,
+                "rationale": entry.get("rationale") or "Optimized using STAR-D principles based on the target role.",
+            })
+        return results
+
     def generate_resume_recommendations(self, analysis_results: Dict) -> List[str]:
         """
         Generates specific, actionable recommendations for resume improvement based on analysis.
@@ -1092,13 +1406,16 @@ Return only the JSON object.
 
 Return only the JSON object with 8-12 relevant inferred skills.
         """
-        response_str = self._call_llm(prompt, temperature=0.3, max_tokens=300)
+        response_str = self._call_llm(prompt, temperature=0.3, max_tokens=300, cache_result=False)
+        raw_response = response_str
         try:
             if response_str.startswith('```json'):
                 response_str = response_str[7:-4].strip()
-            return json.loads(response_str)
+            result = json.loads(response_str)
         except (json.JSONDecodeError, TypeError):
             return {"skills": ""}
+        self._cache_validated(self._llm_cache_key(prompt, 0.3, 300, self.model_name, False), raw_response)
+        return result
 
     def generate_blueprint_parallel(self, resume: Resume, job_description: JobDescription) -> Dict:
         """
@@ -1143,9 +1460,38 @@ Return only the JSON object with 8-12 relevant inferred skills.
                     "performance_mode": "error_fallback"
                 }
 
+    def score_jobs_parallel(self, resume: Resume, job_descriptions: Dict[str, JobDescription], max_workers: int = 8) -> Dict[str, Dict]:
+        """
+        Runs the strategic assessment for many stored jobs concurrently.
+        The worker cap bounds in-flight requests; the OpenAI client retries rate-limited calls with backoff.
+
+        Args:
+            resume: The resume to score.
+            job_descriptions: Mapping of job key (e.g. tracker folder) to JobDescription.
+            max_workers: Maximum number of concurrent API calls.
+
+        Returns:
+            Mapping of job key to assessment dict (or {"error": ...} for that job).
+        """
+        if not job_descriptions:
+            return {}
+        results = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(job_descriptions))) as executor:
+            futures = {
+                executor.submit(self.blueprint_step_1_strategic_assessment, resume, jd): key
+                for key, jd in job_descriptions.items()
+            }
+            for future in concurrent.futures.as_completed(futures):
+                key = futures[future]
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    results[key] = {"error": f"Scoring failed: {str(e)}"}
+        return results
+
     def _get_job_hash(self, raw_text: str) -> str:
-        """Generate a hash for job description caching."""
-        return hashlib.md5(raw_text.encode()).hexdigest()
+        """Generate a hash for job description caching; blake2b matches _cache_key and outruns md5."""
+        return hashlib.blake2b(raw_text.encode(), digest_size=16).hexdigest()
 
     def extract_job_details_cached(self, raw_text: str) -> Dict:
         """
@@ -1389,8 +1735,13 @@ Return only the JSON object with 8-12 relevant inferred skills.
 
     def _find_best_skill_matches(self, job_skills: List[str], resume_skills: List[Dict[str, str]]) -> List[Dict]:
         """Find best semantic matches between job skills and resume skills."""
+        # First resume entry per lowercased skill, for the exact-match pass
+        exact = {}
+        for resume_skill in resume_skills:
+            exact.setdefault(resume_skill['skill'].lower(), resume_skill)
+
         matches = []
-        
+        pending = []  # indices into matches that need a semantic match
         for job_skill in job_skills:
             best_match = {
                 'job_skill': job_skill,
@@ -1402,31 +1753,43 @@ Return only the JSON object with 8-12 relevant inferred skills.
             }
             
             # Check for exact matches first
-            for resume_skill in resume_skills:
-                if job_skill.lower() == resume_skill['skill'].lower():
-                    best_match.update({
-                        'resume_skill': resume_skill['skill'],
-                        'similarity_score': 1.0,
-                        'context': resume_skill['context'],
-                        'source': resume_skill['source'],
-                        'found': True
-                    })
-                    break
-            
-            # If no exact match, find best semantic match
-            if not best_match['found']:
-                for resume_skill in resume_skills:
-                    similarity = self._calculate_semantic_similarity(job_skill, resume_skill['skill'])
-                    if similarity > best_match['similarity_score']:
-                        best_match.update({
-                            'resume_skill': resume_skill['skill'],
-                            'similarity_score': similarity,
-                            'context': resume_skill['context'],
-                            'source': resume_skill['source'],
-                            'found': similarity > 0.7  # Threshold for "found"
-                        })
+            resume_skill = exact.get(job_skill.lower())
+            if resume_skill is not None:
+                best_match.update({
+                    'resume_skill': resume_skill['skill'],
+                    'similarity_score': 1.0,
+                    'context': resume_skill['context'],
+                    'source': resume_skill['source'],
+                    'found': True
+                })
+            else:
+                pending.append(len(matches))
             
             matches.append(best_match)
+
+        if not pending or not resume_skills:
+            return matches
+
+        # If no exact match, find best semantic match: encode each side once in a batch and
+        # score every pair with one matrix product instead of two encodes per pair
+        try:
+            job_embeddings = self.semantic_model.encode([matches[i]['job_skill'] for i in pending], convert_to_tensor=True)
+            resume_embeddings = self.semantic_model.encode([r['skill'] for r in resume_skills], convert_to_tensor=True)
+            best_scores, best_indices = util.cos_sim(job_embeddings, resume_embeddings).max(dim=1)
+        except Exception as e:
+            print(f"Error calculating similarity: {e}")
+            return matches
+
+        for i, score, index in zip(pending, best_scores.tolist(), best_indices.tolist()):
+            if score > 0.0:
+                resume_skill = resume_skills[index]
+                matches[i].update({
+                    'resume_skill': resume_skill['skill'],
+                    'similarity_score': score,
+                    'context': resume_skill['context'],
+                    'source': resume_skill['source'],
+                    'found': score > 0.7  # Threshold for "found"
+                })
         
         return matches
 
@@ -7,7 +7,8 @@ from .data_agent import Resume, JobDescription
 class BlueprintOrchestrator:
     """
     Coordinates blueprint generation steps using the existing GenerationAgent.
-    Steps 1-3 run in parallel; step 4 processes achievements per bullet.
+    All four steps are independent and run in parallel; step 4 also fans out per bullet.
+    Step 3 uses the single-call job bundle, which also carries the cover-letter outline.
     """
 
     def __init__(self, generation_agent):
@@ -24,6 +25,7 @@ class BlueprintOrchestrator:
             "keyword_table": [],
             "editable_summary": "",
             "achievements": {},
+            "bundle": {},
         }
 
         def notify(msg: str):
@@ -33,38 +35,82 @@ class BlueprintOrchestrator:
                 except Exception:
                     pass
 
-        # Steps 1-3 in parallel
-        notify("Step 1/4: Performing strategic assessment...")
-        notify("Step 2/4: Performing semantic skill analysis...")
-        notify("Step 3/4: Rewriting professional summary...")
+        # Steps 1-4 in parallel; report each as it finishes
+        notify("Running strategic assessment, skill analysis, summary and achievement rewrites in parallel...")
 
-        with ThreadPoolExecutor(max_workers=3) as ex:
-            fut1 = ex.submit(self.gen.blueprint_step_1_strategic_assessment, resume, job_description)
-            fut2 = ex.submit(self.gen.blueprint_step_2_semantic_keyword_analysis, resume, job_description)
-            fut3 = ex.submit(self.gen.blueprint_step_3_summary, resume, job_description)
+        with ThreadPoolExecutor(max_workers=4) as ex:
+            futures = {
+                ex.submit(self.gen.blueprint_step_1_strategic_assessment, resume, job_description): ("assessment", "Strategic assessment complete"),
+                ex.submit(self.gen.blueprint_step_2_semantic_keyword_analysis, resume, job_description): ("keyword_table", "Semantic skill analysis complete"),
+                ex.submit(self.gen.generate_jd_bundle, resume, job_description): ("bundle", "Professional summary complete"),
+                ex.submit(self.generate_achievements, resume, job_description): ("achievements", "Achievement bullet points complete"),
+            }
+            for done, fut in enumerate(as_completed(futures), start=1):
+                part, label = futures[fut]
+                parts[part] = fut.result()
+                notify(f"Step {done}/4: {label}")
 
-            for fut in as_completed([fut1, fut2, fut3]):
-                if fut is fut1:
-                    parts["assessment"] = fut.result()
-                elif fut is fut2:
-                    parts["keyword_table"] = fut.result()
-                else:
-                    parts["editable_summary"] = fut.result()
-
-        # Step 4: achievements per bullet
-        notify("Step 4/4: Rewriting achievement bullet points...")
-        if resume.work:
-            for i, work_item in enumerate(resume.work):
-                if not getattr(work_item, "highlights", None):
-                    continue
-                for j, highlight in enumerate(work_item.highlights):
-                    key = f"{i}_{j}"
-                    result = self.gen.blueprint_step_4_achievements(highlight, work_item.name, job_description)
-                    if isinstance(result, dict) and 'error' not in result:
-                        parts["achievements"][key] = {
-                            "original_bullet": result.get("original_bullet") or highlight,
-                            "optimized_bullet": result.get("optimized_bullet") or highlight,
-                            "rationale": result.get("rationale") or "Optimized using STAR-D principles based on the target role.",
-                        }
+        # The bundle's summary stands in for blueprint_step_3_summary, saving a call;
+        # fall back to the dedicated summary step if the bundle call failed
+        bundle = parts["bundle"]
+        if isinstance(bundle, dict) and 'error' not in bundle and bundle.get("summary"):
+            parts["editable_summary"] = bundle["summary"]
+        else:
+            parts["bundle"] = {}
+            parts["editable_summary"] = self.gen.blueprint_step_3_summary(resume, job_description)
 
         return parts
+
+    def generate_achievements(
+        self,
+        resume: Resume,
+        job_description: JobDescription,
+        max_workers: int = 8,
+        progress: Callable[[int, int], None] | None = None,
+        batch_size: int = 8,
+    ) -> Dict:
+        """Rewrite every highlight concurrently; returns {"<work>_<highlight>": suggestion}.
+
+        Highlights are sent batch_size per prompt so the JD context is paid once per batch.
+        progress(done, total) is called from the calling thread as each batch lands.
+        """
+        tasks = [
+            (f"{i}_{j}", highlight, work_item.name)
+            for i, work_item in enumerate(resume.work or [])
+            for j, highlight in enumerate(getattr(work_item, "highlights", None) or [])
+        ]
+        if not tasks:
+            return {}
+        batches = [tasks[k:k + batch_size] for k in range(0, len(tasks), batch_size)]
+
+        # max_workers also caps in-flight requests against the provider's rate limit
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as ex:
+            futures = {
+                ex.submit(
+                    self.gen.blueprint_step_4_achievements_batch,
+                    [(highlight, company) for _, highlight, company in batch],
+                    job_description,
+                ): batch
+                for batch in batches
+            }
+            results = {}
+            done = 0
+            for fut in as_completed(futures):
+                batch = futures[fut]
+                for (key, _, _), result in zip(batch, fut.result()):
+                    results[key] = result
+                done += len(batch)
+                if progress:
+                    progress(done, len(tasks))
+
+        # Keep resume order regardless of completion order
+        achievements = {}
+        for key, highlight, _ in tasks:
+            result = results.get(key)
+            if isinstance(result, dict) and 'error' not in result:
+                achievements[key] = {
+                    "original_bullet": result.get("original_bullet") or highlight,
+                    "optimized_bullet": result.get("optimized_bullet") or highlight,
+                    "rationale": result.get("rationale") or "Optimized using STAR-D principles based on the target role.",
+                }
+        return achievements
@@ -3,14 +3,10 @@ AI Job Coach - Main Application Entry Point
 Modular architecture with separated concerns
 """
 
-import os
 import streamlit as st
 
 # Import data models
 from agents.data_agent import Resume, JobDescription
-from agents.scraper_agent import ScraperAgent
-from agents.analysis_agent import AnalysisAgent
-from agents.generation_agent import GenerationAgent
 
 # Import UI components
 from ui.styles import apply_dark_mode_theme
@@ -20,9 +16,6 @@ from ui.components import render_page_header
 # Import utilities
 from utils.session_state import initialize_session_state
 
-# Import pages
-from pages import settings, job_tracker, job_coach
-
 # Configure page settings
 st.set_page_config(
     page_title="AI Job Coach",
@@ -38,17 +31,30 @@ apply_dark_mode_theme()
 initialize_session_state()
 
 # --- Agent Initialization ---
-@st.cache_resource
+# Each cached (API key, model) pair holds its own agents and embedding models in memory
+AGENT_CACHE_ENTRIES = 2
+
+
+@st.cache_resource(max_entries=AGENT_CACHE_ENTRIES)
 def load_agents(api_key: str, model_name: str):
-    """Load and cache AI agents."""
-    os.environ["OPENAI_MODEL"] = model_name
-    return ScraperAgent(), AnalysisAgent(), GenerationAgent(api_key=api_key)
-
-# Load agents with current configuration
-scraper_agent, analysis_agent, generation_agent = load_agents(
-    st.session_state.get("openai_api_key"),
-    st.session_state.get("preferred_model", "gpt-4o-mini")
-)
+    """Load and cache AI agents; only the most recent configurations stay loaded."""
+    # Imported here so the LLM and embedding libraries load only when a page needs agents
+    from agents.scraper_agent import ScraperAgent
+    from agents.analysis_agent import AnalysisAgent
+    from agents.generation_agent import GenerationAgent
+
+    return ScraperAgent(), AnalysisAgent(), GenerationAgent(api_key=api_key, model_name=model_name)
+
+
+def get_agents():
+    """Load agents with the current configuration."""
+    scraper_agent, analysis_agent, generation_agent = load_agents(
+        st.session_state.get("openai_api_key"),
+        st.session_state.get("preferred_model", "gpt-4o-mini")
+    )
+    # The agents are shared by every session, so this session's cache choice goes on its own view
+    generation_agent = generation_agent.with_cache(not st.session_state.get("bypass_llm_cache", False))
+    return scraper_agent, analysis_agent, generation_agent
 
 # --- Navigation ---
 render_top_nav()
@@ -60,16 +66,22 @@ render_page_header()
 current_page = st.session_state.get('current_page', 'main_app')
 current_step = st.session_state.get('step', 'enter_jd')
 
+# Pages are imported on first visit so a session only loads the views it uses
 if current_page == "job_tracker":
     # Render job tracker page
-    job_tracker.render()
+    from pages import job_tracker
+    # Agents (and the embedding model) are only built if the user asks to rescore
+    job_tracker.render(load_generation_agent=lambda: get_agents()[2])
     
 elif current_step == "settings":
     # Render settings page
+    from pages import settings
     settings.render()
     
 else:
     # Job Coach workflow - fully modular!
+    from pages import job_coach
+    scraper_agent, analysis_agent, generation_agent = get_agents()
     job_coach.render(
         scraper_agent=scraper_agent,
         analysis_agent=analysis_agent,
@@ -1,11 +1,216 @@
+import copy
+import hashlib
 import os
+import re
 import shutil
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from html import escape
 import streamlit as st
 from agents.data_agent import Resume, JobDescription
-from utils.file_helpers import save_job_notes
+from utils.file_helpers import create_job_notes, job_output_folder, sync_file, write_file_atomic
+from utils.session_state import get_resume_json, mark_resume_changed, parse_resume
 from agents.orchestrator import BlueprintOrchestrator
 
+
+JOB_HEADER_TEMPLATE = '<div style="background: linear-gradient(135deg, var(--primary-color), var(--primary-hover)); padding: 2rem; border-radius: 12px; margin-bottom: 1.5rem; box-shadow: 0 4px 6px rgba(0,0,0,0.3);"><h2 style="color: white; margin: 0 0 0.5rem 0; font-size: 1.8rem;">{name}</h2><p style="color: rgba(255,255,255,0.9); margin: 0; font-size: 1.2rem; font-weight: 500;">📍 {org}</p></div>'
+DETAIL_CARD_TEMPLATE = '<div style="background: var(--background-secondary); padding: 1.5rem; border-radius: 10px; border: 1px solid var(--border-color); height: 100%;"><div style="font-size: 0.85rem; color: var(--text-muted); margin-bottom: 0.5rem;">{label}</div><div style="font-size: 1.1rem; color: var(--text-primary); font-weight: 500;">{value}</div></div>'
+LIST_ITEM_TEMPLATE = '<div style="margin-bottom: 0.75rem; padding-left: 1rem; border-left: 3px solid {color};"><span style="color: {color}; font-weight: 600;">{index}.</span> <span style="color: var(--text-secondary);">{text}</span></div>'
+SKILL_TAG = '<span style="background: var(--background-tertiary); color: var(--text-primary); padding: 0.5rem 1rem; border-radius: 20px; font-size: 0.9rem; border: 1px solid var(--border-color);">%s</span>'
+INFERRED_SKILL_TAG = '<span style="background: linear-gradient(135deg, #8b5cf6, #6366f1); color: white; padding: 0.5rem 1rem; border-radius: 20px; font-size: 0.9rem; font-weight: 500; box-shadow: 0 2px 4px rgba(139,92,246,0.3);">%s ✨</span>'
+
+
+# Literal placeholders in typst_templates/coverletter.typ, replaced in render_cover_letter.
+# The group makes split() keep the placeholders at the odd indices.
+COVER_LETTER_PLACEHOLDER_RE = re.compile("(" + "|".join(map(re.escape, (
+    '#let recipient_name = "Talent Management Team"',
+    '#let recipient_title = "Talent Acquisition"',
+    '#let company_name = "<COMPANY NAME>"',
+    '#let company_address = "<ADDRESS>"',
+    '#lorem(50)\n\n#lorem(65)\n\n#lorem(85)',
+    '#v(3em) // Space for signature',
+))) + ")")
+COVER_LETTER_TEMPLATE_PATH = "career_toolkit/typst_templates/coverletter.typ"
+RESUME_TEMPLATE_PATH = "career_toolkit/typst_templates/resume.typ"
+TYPST_ESCAPE_RE = re.compile(r'[\\"]')
+TYPST_ESCAPES = {'\\': '\\\\', '"': '\\"'}
+PRIORITY_COLORS = {"High": "🔴", "Medium": "🟡", "Low": "🟢"}
+# (minimum confidence, CSS class, icon), highest tier first
+CONFIDENCE_TIERS = ((70, "progress-high", "🟢"), (30, "progress-medium", "🟡"))
+LOW_CONFIDENCE_TIER = ("progress-low", "🔴")
+
+
+def confidence_tier(confidence) -> tuple:
+    """(CSS class, icon) for a keyword match confidence percentage."""
+    for threshold, color_class, color_text in CONFIDENCE_TIERS:
+        if confidence >= threshold:
+            return color_class, color_text
+    return LOW_CONFIDENCE_TIER
+
+
+def escape_typst_string(s: str) -> str:
+    """Escape backslashes and quotes for a Typst string literal in one pass."""
+    if not TYPST_ESCAPE_RE.search(s):
+        return s
+    return TYPST_ESCAPE_RE.sub(lambda m: TYPST_ESCAPES[m.group(0)], s)
+
+
+@lru_cache(maxsize=1)
+def find_typst() -> str | None:
+    """Absolute path of the typst binary, looked up on PATH once per process."""
+    return shutil.which("typst")
+
+
+def compile_typst(args: list, status) -> None:
+    """Run `typst compile`, updating the st.status label while it works; raises CalledProcessError on failure."""
+    started = time.monotonic()
+    proc = subprocess.Popen([find_typst() or "typst", "compile", *args], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    # Typst only prints on failure, so the pipes can't fill up while we poll
+    while proc.poll() is None:
+        status.update(label=f"Compiling with Typst... {time.monotonic() - started:.1f}s")
+        time.sleep(0.05)
+    stdout, stderr = proc.communicate()
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, proc.args, stdout, stderr)
+
+
+# Longest Generate PDF Resume waits on a background compile before compiling itself
+PREBUILD_WAIT_SECONDS = 10
+
+
+@st.cache_resource
+def pdf_executor() -> ThreadPoolExecutor:
+    """One background worker shared by all sessions, so speculative Typst compiles never pile up."""
+    return ThreadPoolExecutor(max_workers=1)
+
+
+def resume_pdf_args(output_folder: str) -> list:
+    """Link the resume template into the job folder and return the `typst compile` arguments."""
+    # Link the template into the output folder to ensure it's in the root
+    local_template_path = os.path.join(output_folder, "resume_template.typ")
+    sync_file(os.path.abspath(RESUME_TEMPLATE_PATH), local_template_path, link=True)
+    # The input file is the linked template inside the root
+    return [local_template_path, os.path.join(output_folder, "resume.pdf"), "--root", output_folder]
+
+
+def prebuild_resume_pdf(output_folder: str) -> None:
+    """Compile the resume PDF off the script thread; raises CalledProcessError on failure."""
+    subprocess.run([find_typst(), "compile", *resume_pdf_args(output_folder)], capture_output=True, text=True, check=True)
+
+
+def await_prebuilt_pdf(future, status) -> bool:
+    """Wait for a background compile with a live status label; False means compile in the foreground instead.
+
+    The worker is shared by all sessions, so a compile still queued behind others is cancelled,
+    and one running longer than PREBUILD_WAIT_SECONDS is given up on. Raises CalledProcessError on failure.
+    """
+    if future.cancel():
+        return False
+    started = time.monotonic()
+    while not future.done():
+        elapsed = time.monotonic() - started
+        if elapsed > PREBUILD_WAIT_SECONDS:
+            return False
+        status.update(label=f"Finishing background Typst compile... {elapsed:.1f}s")
+        time.sleep(0.05)
+    future.result()
+    return True
+
+
+@lru_cache(maxsize=4)
+def load_cover_letter_segments(path: str, mtime_ns: int) -> tuple:
+    """Read the cover letter template once per version, pre-split so placeholders sit at the odd indices."""
+    with open(path, 'r') as f:
+        return tuple(COVER_LETTER_PLACEHOLDER_RE.split(f.read()))
+
+
+@lru_cache(maxsize=1)
+def text_counts(text: str) -> tuple:
+    """(characters, words) for the pasted JD; reruns with unchanged text skip the split."""
+    return len(text), len(text.split())
+
+
+@lru_cache(maxsize=32)
+def skill_tags_html(skills: tuple, inferred: frozenset) -> str:
+    """Skill pills for the JD view; skills whose lowercased name is in inferred get the highlighted tag."""
+    tags = ''.join((INFERRED_SKILL_TAG if skill.lower() in inferred else SKILL_TAG) % escape(skill) for skill in skills)
+    return f'<div style="display: flex; flex-wrap: wrap; gap: 0.5rem; margin-top: 1rem;">{tags}</div>'
+
+
+@lru_cache(maxsize=32)
+def numbered_list_html(items: tuple, color: str, inferred: frozenset = frozenset()) -> str:
+    """Numbered JD requirement list; items whose lowercased text is in inferred get a sparkle."""
+    return ''.join(
+        LIST_ITEM_TEMPLATE.format(color=color, index=i, text=f'{escape(item)} ✨' if item.lower() in inferred else escape(item))
+        for i, item in enumerate(items, 1)
+    )
+
+
+def parse_edited_resume(text: str) -> Resume:
+    """Resume for the editor text: the current one if untouched, else validated once per content hash."""
+    if text == get_resume_json():
+        return st.session_state.resume
+    # parse_resume caches on the sha, so Validate followed by Save & Archive parses only once
+    raw = text.encode()
+    return parse_resume(hashlib.sha256(raw).hexdigest(), raw)
+
+
+def jd_display_fields(jd: JobDescription) -> dict:
+    """HTML-escaped JD header fields with their placeholders; built once when a JD is loaded."""
+    return {
+        "name": escape(jd.name or "Job Title"),
+        "org": escape(jd.hiringOrganization or "Company Name"),
+        "location": escape(jd.jobLocation or "Not specified"),
+        "employment_type": escape(jd.employmentType or "Not specified"),
+        "date_posted": escape(jd.datePosted or "Not specified"),
+        "description": escape(jd.description or ""),
+    }
+
+
+# Finished blueprints kept per process; the oldest entry is dropped past this many
+BLUEPRINT_STORE_SIZE = 64
+
+
+@st.cache_resource
+def blueprint_store() -> tuple:
+    """Process-wide ({(API key digest, resume JSON, JD JSON, model): blueprint parts}, lock).
+
+    Survives refreshes and lost sessions; sessions run on separate threads, so every access holds the lock.
+    """
+    return {}, threading.Lock()
+
+
+def blueprint_store_key(generation_agent, resume_json: str, jd_json: str) -> tuple:
+    """Store key scoped to the API key, so one user's blueprints are never served to another."""
+    key_digest = hashlib.sha256((generation_agent.api_key or "").encode("utf-8")).hexdigest()
+    return (key_digest, resume_json, jd_json, generation_agent.model_name)
+
+
+def blueprint_complete(parts: dict, resume: Resume) -> bool:
+    """True when no blueprint step failed, so the parts are safe to reuse for later sessions."""
+    if any(isinstance(part, dict) and 'error' in part for part in parts.values()):
+        return False
+    if any(isinstance(row, dict) and ('error' in row or row.get('keyword') == "Analysis Error") for row in parts.get('keyword_table') or []):
+        return False
+    if str(parts.get('editable_summary', '')).startswith("Error:"):
+        return False
+    # Failed achievement rewrites are dropped, so a short count means a step failed
+    highlight_count = sum(len(getattr(work_item, "highlights", None) or []) for work_item in resume.work or [])
+    return len(parts.get('achievements') or {}) == highlight_count
+
+
+@st.cache_data(show_spinner=False, persist="disk")
+def cached_analysis(resume_json: str, jd_json: str, _resume: Resume, _job_description: JobDescription, _analysis_agent) -> dict:
+    """Run the semantic analysis once per resume/JD content; the JSON strings are the cache key.
+
+    Streamlit hashes the key strings deterministically, so persisted results survive restarts.
+    """
+    return _analysis_agent.analyze(_resume, _job_description)
+
+
 def render(scraper_agent, analysis_agent, generation_agent):
     # Your extracted functions here
 
@@ -34,8 +239,7 @@ def render(scraper_agent, analysis_agent, generation_agent):
         
         # Character count
         if jd_text:
-            char_count = len(jd_text)
-            word_count = len(jd_text.split())
+            char_count, word_count = text_counts(jd_text)
             st.caption(f"📊 {char_count:,} characters • {word_count:,} words")
 
         col1, col2 = st.columns([3, 1])
@@ -56,10 +260,12 @@ def render(scraper_agent, analysis_agent, generation_agent):
             
             with st.spinner("🔍 Analyzing job description with AI..."):
                 # Reset blueprint state for the new job
-                if 'blueprint_generated' in st.session_state:
-                    st.session_state.blueprint_generated = False
-                if 'blueprint_parts' in st.session_state:
-                    st.session_state.blueprint_parts = {}
+                st.session_state.blueprint_generated = False
+                st.session_state.blueprint_parts = {}
+                # Analysis is tagged with resume_version only, so a new JD must drop it;
+                # cached_analysis still answers instantly if this JD was analyzed before
+                st.session_state.analysis_results = None
+                st.session_state.jd_bundle = {}
 
                 # New pipeline: structure -> enrich -> map to JobDescription
                 structured = scraper_agent.structure_from_text(jd_text, generation_agent)
@@ -78,27 +284,20 @@ def render(scraper_agent, analysis_agent, generation_agent):
                 ]
                 job_location_str = ', '.join([p for p in loc_parts if p]).strip(', ')
 
-                # Flatten skills array of objects -> comma-separated string
-                skills_list = []
+                # Flatten skills array of objects -> comma-separated string,
+                # de-duplicating case-insensitively in the same pass; the dict keeps
+                # the first spelling of each skill, in insertion order
+                first_spelling = {}
                 for s in enriched.get('skills') or []:
                     try:
-                        name = (s.get('name') or '').strip()
-                        if name:
-                            skills_list.append(name)
-                        for kw in (s.get('keywords') or []):
-                            kw_s = str(kw).strip()
-                            if kw_s:
-                                skills_list.append(kw_s)
+                        items = [(s.get('name') or '').strip()]
+                        items.extend(str(kw).strip() for kw in (s.get('keywords') or []))
                     except Exception:
                         continue
-                # De-duplicate while preserving order
-                seen = set()
-                flat_skills = []
-                for item in skills_list:
-                    if item.lower() not in seen:
-                        seen.add(item.lower())
-                        flat_skills.append(item)
-                skills_str = ", ".join(flat_skills)
+                    for item in items:
+                        if item:
+                            first_spelling.setdefault(item.lower(), item)
+                skills_str = ", ".join(first_spelling.values())
 
                 extracted_data = {
                     'name': enriched.get('title') or '',
@@ -121,59 +320,50 @@ def render(scraper_agent, analysis_agent, generation_agent):
                     extracted_data['url'] = jd_link
 
                 # Reset added/inferred markers for UI (optional for now)
-                st.session_state.added_skills = []
-                st.session_state.added_qualifications = []
-                st.session_state.added_experience_requirements = []
+                st.session_state.added_skills = frozenset()
+                st.session_state.added_qualifications = frozenset()
+                st.session_state.added_experience_requirements = frozenset()
 
                 st.session_state.job_description = JobDescription(**extracted_data)
+                st.session_state.jd_display = jd_display_fields(st.session_state.job_description)
                 st.session_state.step = "jd_processed"
                 st.rerun()
 
     def render_jd_processed():
         
         jd = st.session_state.job_description
+        # JD text is scraped or model-generated; it goes into the HTML below pre-escaped
+        display = st.session_state.get('jd_display') or jd_display_fields(jd)
         
         # Main job header card
-        st.markdown(f'<div style="background: linear-gradient(135deg, var(--primary-color), var(--primary-hover)); padding: 2rem; border-radius: 12px; margin-bottom: 1.5rem; box-shadow: 0 4px 6px rgba(0,0,0,0.3);"><h2 style="color: white; margin: 0 0 0.5rem 0; font-size: 1.8rem;">{jd.name or "Job Title"}</h2><p style="color: rgba(255,255,255,0.9); margin: 0; font-size: 1.2rem; font-weight: 500;">📍 {jd.hiringOrganization or "Company Name"}</p></div>', unsafe_allow_html=True)
+        st.markdown(JOB_HEADER_TEMPLATE.format_map(display), unsafe_allow_html=True)
         
         # Key details in columns
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.markdown(f'<div style="background: var(--background-secondary); padding: 1.5rem; border-radius: 10px; border: 1px solid var(--border-color); height: 100%;"><div style="font-size: 0.85rem; color: var(--text-muted); margin-bottom: 0.5rem;">📍 LOCATION</div><div style="font-size: 1.1rem; color: var(--text-primary); font-weight: 500;">{jd.jobLocation or "Not specified"}</div></div>', unsafe_allow_html=True)
+            st.markdown(DETAIL_CARD_TEMPLATE.format_map({"label": "📍 LOCATION", "value": display["location"]}), unsafe_allow_html=True)
         
         with col2:
-            st.markdown(f'<div style="background: var(--background-secondary); padding: 1.5rem; border-radius: 10px; border: 1px solid var(--border-color); height: 100%;"><div style="font-size: 0.85rem; color: var(--text-muted); margin-bottom: 0.5rem;">💼 EMPLOYMENT TYPE</div><div style="font-size: 1.1rem; color: var(--text-primary); font-weight: 500;">{jd.employmentType or "Not specified"}</div></div>', unsafe_allow_html=True)
+            st.markdown(DETAIL_CARD_TEMPLATE.format_map({"label": "💼 EMPLOYMENT TYPE", "value": display["employment_type"]}), unsafe_allow_html=True)
         
         with col3:
-            st.markdown(f'<div style="background: var(--background-secondary); padding: 1.5rem; border-radius: 10px; border: 1px solid var(--border-color); height: 100%;"><div style="font-size: 0.85rem; color: var(--text-muted); margin-bottom: 0.5rem;">📅 DATE POSTED</div><div style="font-size: 1.1rem; color: var(--text-primary); font-weight: 500;">{jd.datePosted or "Not specified"}</div></div>', unsafe_allow_html=True)
+            st.markdown(DETAIL_CARD_TEMPLATE.format_map({"label": "📅 DATE POSTED", "value": display["date_posted"]}), unsafe_allow_html=True)
         
         st.markdown("<br>", unsafe_allow_html=True)
         
         # Company description
-        if jd.description:
+        if display["description"]:
             with st.expander("🏢 About the Company", expanded=True):
-                st.markdown(f'<div style="color: var(--text-secondary); line-height: 1.6;">{jd.description}</div>', unsafe_allow_html=True)
+                st.markdown(f'<div style="color: var(--text-secondary); line-height: 1.6;">{display["description"]}</div>', unsafe_allow_html=True)
         
         # Skills section with enhanced styling
         if jd.skills:
             with st.expander("🎯 Required Skills & Technologies", expanded=True):
-                skills_list = [s.strip() for s in jd.skills.split(',') if s.strip()]
+                skills_list = tuple(s.strip() for s in jd.skills.split(',') if s.strip())
                 
-                # Highlight inferred skills
-                inferred_set = set(st.session_state.added_skills) if st.session_state.added_skills else set()
-                
-                skills_html = '<div style="display: flex; flex-wrap: wrap; gap: 0.5rem; margin-top: 1rem;">'
-                for skill in skills_list:
-                    if skill in inferred_set:
-                        # Inferred skills - different color
-                        skills_html += f'<span style="background: linear-gradient(135deg, #8b5cf6, #6366f1); color: white; padding: 0.5rem 1rem; border-radius: 20px; font-size: 0.9rem; font-weight: 500; box-shadow: 0 2px 4px rgba(139,92,246,0.3);">{skill} ✨</span>'
-                    else:
-                        # Regular skills
-                        skills_html += f'<span style="background: var(--background-tertiary); color: var(--text-primary); padding: 0.5rem 1rem; border-radius: 20px; font-size: 0.9rem; border: 1px solid var(--border-color);">{skill}</span>'
-                skills_html += '</div>'
-                
-                st.markdown(skills_html, unsafe_allow_html=True)
+                # Inferred skills get a different color; the markup is rebuilt only when the skills change
+                st.markdown(skill_tags_html(skills_list, st.session_state.added_skills), unsafe_allow_html=True)
                 
                 if st.session_state.added_skills:
                     st.info(f"✨ **AI-Inferred Skills:** I've identified {len(st.session_state.added_skills)} additional skills that weren't explicitly listed but are relevant to this role.")
@@ -181,21 +371,15 @@ def render(scraper_agent, analysis_agent, generation_agent):
         # Responsibilities
         if jd.responsibilities:
             with st.expander("📋 Key Responsibilities", expanded=False):
-                for i, resp in enumerate(jd.responsibilities, 1):
-                    st.markdown(f'<div style="margin-bottom: 0.75rem; padding-left: 1rem; border-left: 3px solid var(--primary-color);"><span style="color: var(--primary-color); font-weight: 600;">{i}.</span> <span style="color: var(--text-secondary);">{resp}</span></div>', unsafe_allow_html=True)
+                st.markdown(numbered_list_html(tuple(jd.responsibilities), "var(--primary-color)"), unsafe_allow_html=True)
         
         # Qualifications - mark AI-inferred items
         if jd.qualifications:
             with st.expander("✅ Required Qualifications", expanded=False):
                 # Check if we have AI-inferred qualifications tracked
-                inferred_quals = set(st.session_state.get('added_qualifications', []))
-                
-                for i, qual in enumerate(jd.qualifications, 1):
-                    # Add sparkle if AI-inferred
-                    qual_display = qual
-                    if qual in inferred_quals:
-                        qual_display = f'{qual} ✨'
-                    st.markdown(f'<div style="margin-bottom: 0.75rem; padding-left: 1rem; border-left: 3px solid var(--secondary-color);"><span style="color: var(--secondary-color); font-weight: 600;">{i}.</span> <span style="color: var(--text-secondary);">{qual_display}</span></div>', unsafe_allow_html=True)
+                inferred_quals = st.session_state.added_qualifications
+                # AI-inferred items get a sparkle
+                st.markdown(numbered_list_html(tuple(jd.qualifications), "var(--secondary-color)", inferred_quals), unsafe_allow_html=True)
                 
                 if inferred_quals:
                     st.info(f"✨ **AI-Enhanced:** {len(inferred_quals)} qualification(s) were intelligently inferred from the job description.")
@@ -204,14 +388,9 @@ def render(scraper_agent, analysis_agent, generation_agent):
         if jd.experienceRequirements:
             with st.expander("💼 Experience Requirements", expanded=False):
                 # Check if we have AI-inferred experience requirements tracked
-                inferred_exp = set(st.session_state.get('added_experience_requirements', []))
-                
-                for i, exp in enumerate(jd.experienceRequirements, 1):
-                    # Add sparkle if AI-inferred
-                    exp_display = exp
-                    if exp in inferred_exp:
-                        exp_display = f'{exp} ✨'
-                    st.markdown(f'<div style="margin-bottom: 0.75rem; padding-left: 1rem; border-left: 3px solid var(--info-color);"><span style="color: var(--info-color); font-weight: 600;">{i}.</span> <span style="color: var(--text-secondary);">{exp_display}</span></div>', unsafe_allow_html=True)
+                inferred_exp = st.session_state.added_experience_requirements
+                # AI-inferred items get a sparkle
+                st.markdown(numbered_list_html(tuple(jd.experienceRequirements), "var(--info-color)", inferred_exp), unsafe_allow_html=True)
                 
                 if inferred_exp:
                     st.info(f"✨ **AI-Enhanced:** {len(inferred_exp)} experience requirement(s) were intelligently inferred.")
@@ -219,8 +398,7 @@ def render(scraper_agent, analysis_agent, generation_agent):
         # Education requirements
         if jd.educationRequirements:
             with st.expander("🎓 Education Requirements", expanded=False):
-                for i, edu in enumerate(jd.educationRequirements, 1):
-                    st.markdown(f'<div style="margin-bottom: 0.75rem; padding-left: 1rem; border-left: 3px solid var(--warning-color);"><span style="color: var(--warning-color); font-weight: 600;">{i}.</span> <span style="color: var(--text-secondary);">{edu}</span></div>', unsafe_allow_html=True)
+                st.markdown(numbered_list_html(tuple(jd.educationRequirements), "var(--warning-color)"), unsafe_allow_html=True)
         
         # Benefits
         if jd.jobBenefits:
@@ -233,44 +411,50 @@ def render(scraper_agent, analysis_agent, generation_agent):
         
         # Developer view - collapsed by default
         with st.expander("🔧 Developer View (Raw JSON)", expanded=False):
-            st.json(jd.model_dump_json(indent=2, exclude_none=True))
+            st.json(jd.model_dump(mode="json", exclude_none=True))
         
         st.markdown("---")
         
         # Alignment Report (Markdown)
         st.subheader("📊 Alignment Report")
-        if 'structured_jd_v1' not in st.session_state or not isinstance(st.session_state.structured_jd_v1, dict):
+        if not isinstance(st.session_state.get('structured_jd_v1'), dict):
             st.info("Alignment report becomes available after the job description is structured. Go back and re-process the JD if needed.")
         else:
             col_a, col_b = st.columns([1, 1])
             with col_a:
-                if st.button("Generate Alignment Report", key="gen_align_report", type="primary"):
-                    with st.spinner("Generating alignment report..."):
-                        md = generation_agent.generate_alignment_report_markdown(
+                generate_clicked = st.button("Generate Alignment Report", key="gen_align_report", type="primary")
+            if generate_clicked:
+                # Show the report as it is written; the finished text is rendered below with the rest
+                live_report = st.empty()
+                with live_report.container():
+                    st.session_state.alignment_report_md = st.write_stream(
+                        generation_agent.generate_alignment_report_markdown_stream(
                             st.session_state.resume,
                             st.session_state.structured_jd_v1
                         )
-                        st.session_state.alignment_report_md = md
+                    )
+                live_report.empty()
+            report_md = st.session_state.get('alignment_report_md')
             with col_b:
-                if st.session_state.get('alignment_report_md'):
+                if report_md:
                     st.download_button(
                         label="Download Report (.md)",
-                        data=st.session_state.alignment_report_md,
+                        data=report_md,
                         file_name="alignment_report.md",
                         mime="text/markdown",
                         key="dl_align_report"
                     )
 
-            if st.session_state.get('alignment_report_md'):
-                st.markdown(st.session_state.alignment_report_md)
+            if report_md:
+                st.markdown(report_md)
                 if st.button("Regenerate Report", key="regen_align_report"):
-                    with st.spinner("Regenerating alignment report..."):
-                        md = generation_agent.generate_alignment_report_markdown(
+                    st.session_state.alignment_report_md = st.write_stream(
+                        generation_agent.uncached().generate_alignment_report_markdown_stream(
                             st.session_state.resume,
                             st.session_state.structured_jd_v1
                         )
-                        st.session_state.alignment_report_md = md
-                        st.rerun()
+                    )
+                    st.rerun()
         
         # Action buttons
         col1, col2 = st.columns([2, 1])
@@ -293,15 +477,17 @@ def render(scraper_agent, analysis_agent, generation_agent):
         st.subheader("1. Strategic Assessment")
         if st.button("Rerun Strategic Assessment", key="rerun_assessment"):
             with st.spinner("Re-running strategic assessment..."):
-                st.session_state.blueprint_parts['assessment'] = generation_agent.blueprint_step_1_strategic_assessment(resume, st.session_state.job_description)
+                st.session_state.blueprint_parts['assessment'] = generation_agent.uncached().blueprint_step_1_strategic_assessment(resume, st.session_state.job_description)
                 st.success("Strategic assessment updated.")
                 st.rerun()
         if 'error' not in assessment:
-            st.markdown(f"* **Position Alignment Score:** {assessment.get('alignment_score', 'N/A')}")
-            st.markdown(f"* **Overall Fitness:** {assessment.get('overall_fitness', 'N/A')}")
-            st.markdown("* **Key Opportunity Areas:**")
-            for opp in assessment.get('key_opportunities', []):
-                st.markdown(f"  * {opp}")
+            assessment_lines = [
+                f"* **Position Alignment Score:** {assessment.get('alignment_score', 'N/A')}",
+                f"* **Overall Fitness:** {assessment.get('overall_fitness', 'N/A')}",
+                "* **Key Opportunity Areas:**",
+            ]
+            assessment_lines.extend(f"  * {opp}" for opp in assessment.get('key_opportunities', []))
+            st.markdown("\n".join(assessment_lines))
         else:
             st.error(assessment.get('error', 'Failed to generate assessment.'))
         st.divider()
@@ -334,8 +520,7 @@ def render(scraper_agent, analysis_agent, generation_agent):
                     
                     # Priority with enhanced color coding
                     priority = item.get('priority', 'N/A')
-                    priority_colors = {"High": "🔴", "Medium": "🟡", "Low": "🟢"}
-                    priority_color = priority_colors.get(priority, "⚪")
+                    priority_color = PRIORITY_COLORS.get(priority, "⚪")
                     with col2:
                         st.markdown(f"{priority_color} **{priority}**")
                         st.caption("Priority")
@@ -344,15 +529,7 @@ def render(scraper_agent, analysis_agent, generation_agent):
                     confidence = item.get('confidence', 0)
                     with col3:
                         # Determine color class based on score
-                        if confidence >= 70:
-                            color_class = "progress-high"
-                            color_text = "🟢"
-                        elif confidence >= 30:
-                            color_class = "progress-medium"
-                            color_text = "🟡"
-                        else:
-                            color_class = "progress-low"
-                            color_text = "🔴"
+                        color_class, color_text = confidence_tier(confidence)
                         
                         # Create colored progress bar
                         st.markdown(f'<div class="{color_class}">', unsafe_allow_html=True)
@@ -383,34 +560,32 @@ def render(scraper_agent, analysis_agent, generation_agent):
         st.markdown("### Recommended Professional Summary")
         if st.button("Regenerate Summary", key="rerun_summary"):
             with st.spinner("Re-generating professional summary..."):
-                st.session_state.blueprint_parts['editable_summary'] = generation_agent.blueprint_step_3_summary(resume, st.session_state.job_description)
+                st.session_state.blueprint_parts['editable_summary'] = generation_agent.uncached().blueprint_step_3_summary(resume, st.session_state.job_description)
                 st.success("Summary updated.")
                 st.rerun()
         edited_summary = st.text_area("Edit the AI-generated summary below:", value=st.session_state.blueprint_parts.get('editable_summary', ''), height=150, key="editable_summary_area")
         if st.button("Update Resume Summary"):
             st.session_state.resume.basics.summary = edited_summary
+            mark_resume_changed()
             st.success("Professional summary updated in the resume editor below!")
             st.rerun()
         st.divider()
 
+        render_achievements()
+
+    @st.fragment
+    def render_achievements():
+        """Achievement suggestions; editing a bullet reruns only this section."""
         st.markdown("### Achievement-Driven Bullet Points")
         if st.button("Rerun Achievement Suggestions", key="rerun_achievements"):
-            with st.spinner("Re-running achievement suggestions..."):
-                st.session_state.blueprint_parts['achievements'] = {}
-                for i, work_item in enumerate(resume.work):
-                    if work_item.highlights:
-                        for j, highlight in enumerate(work_item.highlights):
-                            unique_key = f"{i}_{j}"
-                            result = generation_agent.blueprint_step_4_achievements(highlight, work_item.name, st.session_state.job_description)
-                            if isinstance(result, dict) and 'error' not in result:
-                                safe = {
-                                    'original_bullet': result.get('original_bullet') or highlight,
-                                    'optimized_bullet': result.get('optimized_bullet') or highlight,
-                                    'rationale': result.get('rationale') or 'Optimized using STAR-D principles based on the target role.'
-                                }
-                                st.session_state.blueprint_parts['achievements'][unique_key] = safe
-                st.success("Achievement suggestions updated.")
-                st.rerun()
+            with st.status("Re-running achievement suggestions...") as status:
+                st.session_state.blueprint_parts['achievements'] = BlueprintOrchestrator(generation_agent.uncached()).generate_achievements(
+                    st.session_state.resume, st.session_state.job_description,
+                    progress=lambda done, total: status.update(label=f"Rewrote {done}/{total} bullet points...")
+                )
+                status.update(label="Achievement suggestions updated.", state="complete")
+                # Only this section shows the suggestions
+                st.rerun(scope="fragment")
         # Defensive normalization in case old sessions have malformed entries
         ach_store = st.session_state.blueprint_parts.get('achievements', {})
         if isinstance(ach_store, dict):
@@ -429,14 +604,18 @@ def render(scraper_agent, analysis_agent, generation_agent):
                         'rationale': 'Optimized using STAR-D principles based on the target role.'
                     }
 
+        work_items = st.session_state.resume.work
         for key, result in st.session_state.blueprint_parts.get('achievements', {}).items():
             try:
                 work_idx, highlight_idx = map(int, key.split('_'))
-                if work_idx >= len(st.session_state.resume.work) or highlight_idx >= len(st.session_state.resume.work[work_idx].highlights):
+                if work_idx >= len(work_items):
+                    continue
+                work_item = work_items[work_idx]
+                highlights = work_item.highlights
+                if highlight_idx >= len(highlights):
                     continue
 
-                st.markdown(f"**For your role at {st.session_state.resume.work[work_idx].name}:**")
-                st.markdown(f"* **Original:** {result.get('original_bullet', 'N/A')}")
+                st.markdown(f"**For your role at {work_item.name}:**\n\n* **Original:** {result.get('original_bullet', 'N/A')}")
                 
                 edited_bullet = st.text_area(
                     "Edit the AI-optimized bullet point:", 
@@ -450,10 +629,12 @@ def render(scraper_agent, analysis_agent, generation_agent):
 
                 if st.button("Apply this suggestion", key=f"apply_{key}"):
                     original = result.get('original_bullet', '')
-                    if original and st.session_state.resume.work[work_idx].highlights[highlight_idx] == original:
-                        st.session_state.resume.work[work_idx].highlights[highlight_idx] = edited_bullet
+                    if original and highlights[highlight_idx] == original:
+                        highlights[highlight_idx] = edited_bullet
+                        mark_resume_changed()
                         st.success("Suggestion applied! The resume editor below has been updated.")
                         del st.session_state.blueprint_parts['achievements'][key]
+                        # Full rerun so the resume editor below picks up the change
                         st.rerun()
                     else:
                         st.warning("The original bullet point seems to have changed. Cannot apply suggestion automatically.")
@@ -471,10 +652,16 @@ def render(scraper_agent, analysis_agent, generation_agent):
             return  # Stop rendering this page
 
         # --- Initial, Fast Analysis --- 
-        if not st.session_state.analysis_results or st.session_state.analysis_results.get('resume_hash') != hash(st.session_state.resume.model_dump_json()):
+        if not st.session_state.analysis_results or st.session_state.analysis_results.get('resume_version') != st.session_state.resume_version:
             with st.spinner("Comparing your resume to the job description..."):
-                st.session_state.analysis_results = analysis_agent.analyze(st.session_state.resume, st.session_state.job_description)
-                st.session_state.analysis_results['resume_hash'] = hash(st.session_state.resume.model_dump_json())
+                st.session_state.analysis_results = cached_analysis(
+                    get_resume_json(),
+                    st.session_state.job_description.model_dump_json(),
+                    st.session_state.resume,
+                    st.session_state.job_description,
+                    analysis_agent
+                )
+                st.session_state.analysis_results['resume_version'] = st.session_state.resume_version
         
         st.metric("Overall Resume Match Score", st.session_state.analysis_results.get('overall_score', 'N/A'))
         st.markdown("--- ")
@@ -487,13 +674,33 @@ def render(scraper_agent, analysis_agent, generation_agent):
                 resume = st.session_state.resume
                 jd = st.session_state.job_description
 
-                # Use orchestrator to run steps with progress updates
-                orchestrator = BlueprintOrchestrator(generation_agent)
-                parts = orchestrator.generate_blueprint(
-                    resume,
-                    jd,
-                    progress=lambda msg: status.write(msg)
-                )
+                store, store_lock = blueprint_store()
+                store_key = blueprint_store_key(generation_agent, get_resume_json(), jd.model_dump_json())
+                cached_parts = None
+                if generation_agent.cache_enabled:
+                    with store_lock:
+                        cached_parts = store.get(store_key)
+                if cached_parts is not None:
+                    # Same resume and JD as an earlier run, e.g. before a browser refresh
+                    parts = copy.deepcopy(cached_parts)
+                else:
+                    # Use orchestrator to run steps with progress updates
+                    orchestrator = BlueprintOrchestrator(generation_agent)
+                    parts = orchestrator.generate_blueprint(
+                        resume,
+                        jd,
+                        progress=lambda msg: status.write(msg)
+                    )
+                    # Failed steps (rate limits, timeouts, a bad key) must not be replayed to later sessions
+                    if blueprint_complete(parts, resume):
+                        stored_parts = copy.deepcopy(parts)
+                        with store_lock:
+                            store[store_key] = stored_parts
+                            if len(store) > BLUEPRINT_STORE_SIZE:
+                                del store[next(iter(store))]
+                # Keep the single-call bundle so downstream steps reuse it instead of re-calling the API
+                # Tagged with the resume version, since the outline quotes the resume as it is now
+                st.session_state.jd_bundle = {**parts.pop('bundle', {}), 'resume_version': st.session_state.resume_version}
                 st.session_state.blueprint_parts = parts
                 st.session_state.blueprint_generated = True
                 status.update(label="Blueprint generation complete!", state="complete", expanded=True)
@@ -507,14 +714,12 @@ def render(scraper_agent, analysis_agent, generation_agent):
         st.markdown("### 📝 Live Resume Editor")
         
         # Create a sanitized folder name from the job title
-        job_title = st.session_state.job_description.name or "Untitled Job"
-        sanitized_title = "".join(c for c in job_title if c.isalnum() or c in (' ', '_')).rstrip()
-        output_folder = os.path.join("output", sanitized_title)
+        output_folder = job_output_folder(st.session_state.job_description.name)
 
         # Editable text area for the resume
         edited_resume_json = st.text_area(
             "Edit your resume JSON below. Click 'Save & Archive' to save your changes.",
-            value=st.session_state.resume.model_dump_json(indent=2),
+            value=get_resume_json(),
             height=500
         )
 
@@ -523,12 +728,19 @@ def render(scraper_agent, analysis_agent, generation_agent):
         # Validate Improvements Button
         if col1.button("🔍 Validate Improvements", use_container_width=True):
             try:
-                # Parse the edited resume
-                new_resume = Resume.model_validate_json(edited_resume_json)
+                # Parse the edited resume; an untouched editor is the current resume, so skip validation
+                new_resume = parse_edited_resume(edited_resume_json)
                 
                 # Run new analysis
                 with st.spinner("Analyzing improvements..."):
-                    new_analysis = analysis_agent.analyze(new_resume, st.session_state.job_description)
+                    # The editor text already identifies the resume; no need to re-serialize it for the key
+                    new_analysis = cached_analysis(
+                        edited_resume_json,
+                        st.session_state.job_description.model_dump_json(),
+                        new_resume,
+                        st.session_state.job_description,
+                        analysis_agent
+                    )
                     
                     # Compare with old analysis
                     if st.session_state.analysis_results:
@@ -567,8 +779,9 @@ def render(scraper_agent, analysis_agent, generation_agent):
                         # Option to apply changes
                         if st.button("✅ Apply These Changes"):
                             st.session_state.resume = new_resume
+                            mark_resume_changed()
                             st.session_state.analysis_results = new_analysis
-                            st.session_state.analysis_results['resume_hash'] = hash(new_resume.model_dump_json())
+                            st.session_state.analysis_results['resume_version'] = st.session_state.resume_version
                             st.success("Changes applied! Resume updated.")
                             st.rerun()
                     else:
@@ -578,29 +791,30 @@ def render(scraper_agent, analysis_agent, generation_agent):
                 st.error(f"Error validating improvements: {e}")
         
         if col2.button("💾 Save & Archive", use_container_width=True):
-            # Create initial notes file
-            notes_path = os.path.join(output_folder, "notes.json")
-            if not os.path.exists(notes_path):
-                initial_notes = {
+            try:
+                # Validate the edited JSON; saving an untouched editor keeps the current analysis
+                new_resume = parse_edited_resume(edited_resume_json)
+                if new_resume is not st.session_state.resume:
+                    st.session_state.resume = new_resume
+                    mark_resume_changed()
+
+                # Only a valid resume creates the job folder and its initial notes (unless they already exist)
+                os.makedirs(output_folder, exist_ok=True)
+                create_job_notes(output_folder, {
                     "status": "Not Applied",
                     "applied_date": None,
                     "closed_date": None,
                     "comments": ""
-                }
-                save_job_notes(output_folder, initial_notes)
-            try:
-                # Validate the edited JSON
-                new_resume = Resume.model_validate_json(edited_resume_json)
-                st.session_state.resume = new_resume
+                })
 
-                # Create directory and save files
-                os.makedirs(output_folder, exist_ok=True)
-                with open(os.path.join(output_folder, "resume.json"), "w") as f:
-                    f.write(edited_resume_json)
-                with open(os.path.join(output_folder, "job_description.json"), "w") as f:
-                    f.write(st.session_state.job_description.model_dump_json(indent=2))
+                # Save files
+                write_file_atomic(os.path.join(output_folder, "resume.json"), edited_resume_json)
+                write_file_atomic(os.path.join(output_folder, "job_description.json"), st.session_state.job_description.model_dump_json(indent=2))
                 
                 st.session_state.files_saved = True
+                # Start the PDF now so it is usually ready by the time Generate PDF Resume is clicked
+                if find_typst():
+                    st.session_state.resume_pdf_job = (output_folder, pdf_executor().submit(prebuild_resume_pdf, output_folder))
                 st.success(f"Resume and job description saved to `{output_folder}`! Re-running analysis with updated resume...")
                 st.rerun()
 
@@ -608,34 +822,31 @@ def render(scraper_agent, analysis_agent, generation_agent):
                 st.error(f"Error saving resume. Please ensure it is valid JSON. Details: {e}")
 
         if col3.button("📄 Generate PDF Resume", use_container_width=True, disabled=not st.session_state.get('files_saved', False)):
-            if not shutil.which("typst"):
+            if not find_typst():
+                # Don't remember a miss, so installing typst doesn't need an app restart
+                find_typst.cache_clear()
                 st.error("Typst is not installed or not in your system's PATH. Please install it to generate a PDF.")
                 return
 
-            with st.spinner("Generating PDF resume..."):
+            with st.status("Generating PDF resume...") as status:
                 try:
-                    source_template_path = os.path.abspath("career_toolkit/typst_templates/resume.typ")
-                    # Copy the template into the output folder to ensure it's in the root
-                    local_template_path = os.path.join(output_folder, "resume_template.typ")
-                    shutil.copy(source_template_path, local_template_path)
-
                     output_pdf_path = os.path.join(output_folder, "resume.pdf")
-
-                    # Run the typst compile command, setting the root to the output folder.
-                    # The input file is now the *copied* template inside the root.
-                    process = subprocess.run(
-                        ["typst", "compile", local_template_path, output_pdf_path, "--root", output_folder],
-                        capture_output=True,
-                        text=True,
-                        check=True
-                    )
+                    # Reuse the compile started by Save & Archive if it belongs to this job
+                    pending = st.session_state.pop('resume_pdf_job', None)
+                    if not (pending and pending[0] == output_folder and await_prebuilt_pdf(pending[1], status)):
+                        # Run the typst compile command, setting the root to the output folder
+                        compile_typst(resume_pdf_args(output_folder), status)
+                    status.update(label="PDF resume generated", state="complete")
                     st.success(f"Successfully generated PDF! View it at: `{output_pdf_path}`")
 
                 except FileNotFoundError:
-                    st.error(f"Typst template file not found at `{source_template_path}`.")
+                    status.update(label="PDF generation failed", state="error")
+                    st.error(f"Typst template file not found at `{os.path.abspath(RESUME_TEMPLATE_PATH)}`.")
                 except subprocess.CalledProcessError as e:
+                    status.update(label="PDF generation failed", state="error")
                     st.error(f"Failed to compile Typst resume. Error:\n{e.stderr}")
                 except Exception as e:
+                    status.update(label="PDF generation failed", state="error")
                     st.error(f"An unexpected error occurred during PDF generation: {e}")
 
         if col4.button("✉️ Cover Letter", use_container_width=True):
@@ -661,21 +872,23 @@ def render(scraper_agent, analysis_agent, generation_agent):
         st.markdown("#### Cover Letter Content")
         if st.button("Generate/Regenerate AI Cover Letter"):
             with st.spinner("Crafting your cover letter..."):
-                # Generate the content
-                cover_letter_content = generation_agent.generate_cover_letter(
+                # Generate the content; a click with a draft present means the user wants a fresh one
+                writer = generation_agent.uncached() if st.session_state.cover_letter else generation_agent
+                # The blueprint's outline is only reused while the resume is unchanged since it was made
+                bundle = st.session_state.get('jd_bundle', {})
+                story_points = bundle.get('cover_letter_outline') if bundle.get('resume_version') == st.session_state.resume_version else None
+                cover_letter_content = writer.generate_cover_letter(
                     st.session_state.resume, 
                     st.session_state.job_description, 
-                    st.session_state.recipient_name
+                    st.session_state.recipient_name,
+                    story_points=story_points
                 )
                 st.session_state.cover_letter = cover_letter_content
 
                 # Save the raw text content to the output folder
-                job_title = st.session_state.job_description.name or "Untitled Job"
-                sanitized_title = "".join(c for c in job_title if c.isalnum() or c in (' ', '_')).rstrip()
-                output_folder = os.path.join("output", sanitized_title)
+                output_folder = job_output_folder(st.session_state.job_description.name)
                 os.makedirs(output_folder, exist_ok=True)
-                with open(os.path.join(output_folder, "cover_letter_content.txt"), "w") as f:
-                    f.write(cover_letter_content)
+                write_file_atomic(os.path.join(output_folder, "cover_letter_content.txt"), cover_letter_content)
                 st.success(f"Cover letter content saved to `{os.path.join(output_folder, 'cover_letter_content.txt')}`")
 
         st.session_state.cover_letter = st.text_area(
@@ -686,42 +899,36 @@ def render(scraper_agent, analysis_agent, generation_agent):
 
         # --- PDF Generation ---
         if st.button("Generate PDF Cover Letter", disabled=not st.session_state.cover_letter):
-            if not shutil.which("typst"):
+            if not find_typst():
+                # Don't remember a miss, so installing typst doesn't need an app restart
+                find_typst.cache_clear()
                 st.error("Typst is not installed or not in your system's PATH. Please install it to generate a PDF.")
                 return
 
-            job_title = st.session_state.job_description.name or "Untitled Job"
-            sanitized_title = "".join(c for c in job_title if c.isalnum() or c in (' ', '_')).rstrip()
-            output_folder = os.path.join("output", sanitized_title)
+            output_folder = job_output_folder(st.session_state.job_description.name)
             os.makedirs(output_folder, exist_ok=True)
 
-            with st.spinner("Generating PDF cover letter..."):
+            with st.status("Generating PDF cover letter...") as status:
                 try:
-                    template_path = "career_toolkit/typst_templates/coverletter.typ"
+                    template_path = COVER_LETTER_TEMPLATE_PATH
                     output_typ_path = os.path.join(output_folder, "cover_letter.typ")
                     output_pdf_path = os.path.join(output_folder, "cover_letter.pdf")
 
-                    # Save the user-uploaded signature directly into the output folder
-                    if st.session_state.signature_content and st.session_state.signature_filename:
-                        signature_path = os.path.join(output_folder, st.session_state.signature_filename)
-                        with open(signature_path, "wb") as f:
-                            f.write(st.session_state.signature_content)
-
-                    with open(template_path, 'r') as f:
-                        template_content = f.read()
-
-                    def escape_typst_string(s):
-                        return s.replace('\\', '\\\\').replace('"', '\\"')
+                    # Copy the user-uploaded signature into the output folder
+                    if st.session_state.signature_path and st.session_state.signature_filename:
+                        sync_file(
+                            st.session_state.signature_path,
+                            os.path.join(output_folder, st.session_state.signature_filename)
+                        )
 
-                    def escape_typst_string(s):
-                        return s.replace('\\', '\\\\').replace('"', '\\"')
+                    segments = load_cover_letter_segments(template_path, os.stat(template_path).st_mtime_ns)
 
                     # Dynamically add the signature image to the template if it exists
                     signature_typst_code = ""
-                    if st.session_state.signature_content and st.session_state.signature_filename:
+                    if st.session_state.signature_path and st.session_state.signature_filename:
                         signature_typst_code = f'#image("{escape_typst_string(st.session_state.signature_filename)}", width: 150pt)\n#v(-1em)'
                     
-                    # Replace placeholders in the template
+                    # Swap each placeholder segment for its value; the template text itself is never rescanned
                     replacements = {
                         '#let recipient_name = "Talent Management Team"': f'#let recipient_name = "{escape_typst_string(st.session_state.recipient_name)}"',
                         '#let recipient_title = "Talent Acquisition"': f'#let recipient_title = "{escape_typst_string(st.session_state.recipient_title)}"',
@@ -730,35 +937,31 @@ def render(scraper_agent, analysis_agent, generation_agent):
                         '#lorem(50)\n\n#lorem(65)\n\n#lorem(85)': str(st.session_state.cover_letter or '').replace('\n', '\n\n'),
                         '#v(3em) // Space for signature': signature_typst_code
                     }
-                    for placeholder, value in replacements.items():
-                        template_content = template_content.replace(placeholder, value)
+                    parts = list(segments)
+                    parts[1::2] = [replacements[placeholder] for placeholder in segments[1::2]]
+                    template_content = "".join(parts)
 
                     with open(output_typ_path, 'w') as f:
                         f.write(template_content)
 
                     # Run Typst compilation
-                    subprocess.run(
-                        ["typst", "compile", output_typ_path, "--root", output_folder],
-                        capture_output=True, text=True, check=True
-                    )
+                    compile_typst([output_typ_path, "--root", output_folder], status)
+                    status.update(label="PDF cover letter generated", state="complete")
                     st.success(f"Successfully generated cover letter PDF! View it at: `{output_pdf_path}`")
 
                 except subprocess.CalledProcessError as e:
+                    status.update(label="PDF generation failed", state="error")
                     st.error(f"Failed to compile Typst cover letter. Error:\n{e.stderr}")
                 except Exception as e:
+                    status.update(label="PDF generation failed", state="error")
                     st.error(f"An unexpected error occurred: {e}")
     
     # Route to appropriate function based on current step
-    step = st.session_state.get('step', 'enter_jd')
-    
-    if step == "enter_jd":
-        render_enter_jd()
-    elif step == "jd_processed":
-        render_jd_processed()
-    elif step == "skill_gap":
-        render_skill_gap()
-    elif step == "cover_letter":
-        render_cover_letter()
-    else:
-        # Default to enter_jd
-        render_enter_jd()
+    step_renderers = {
+        "enter_jd": render_enter_jd,
+        "jd_processed": render_jd_processed,
+        "skill_gap": render_skill_gap,
+        "cover_letter": render_cover_letter,
+    }
+    # initialize_session_state has already normalized unknown steps
+    step_renderers[st.session_state.step]()
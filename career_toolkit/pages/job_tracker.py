@@ -4,170 +4,315 @@ import os
 import json
 import shutil
 import streamlit as st
+from dataclasses import dataclass
 from datetime import datetime
-from utils.file_helpers import get_job_notes, save_job_notes
+from functools import lru_cache
+from operator import attrgetter
+from agents.data_agent import JobDescription
+from utils.file_helpers import save_job_notes, OUTPUT_DIR
 
 
-def render():
-    """Render the job tracker page with all job applications."""
-    output_dir = "output"
-    if not os.path.exists(output_dir) or not os.listdir(output_dir):
-        st.info("No job applications have been saved yet. Analyze a job to get started!")
-        return
+# Application statuses in workflow order, with the icon shown on each card
+STATUS_ICONS = {
+    "Not Applied": "🔵",
+    "Applied": "🟡",
+    "Interviewing": "🟠",
+    "Offer Received": "🟢",
+    "Offer Accepted": "✅",
+    "Closed/Rejected": "🔴",
+}
+STATUS_LINES = {status: f"{icon} **Status:** {status}" for status, icon in STATUS_ICONS.items()}
+STATUS_OPTIONS = tuple(STATUS_ICONS)
+STATUS_INDEX = {status: i for i, status in enumerate(STATUS_OPTIONS)}
 
-    job_folders = [d for d in os.listdir(output_dir) if os.path.isdir(os.path.join(output_dir, d))]
-    
-    # Create a list of job data for better organization
+
+@dataclass(slots=True)
+class JobRecord:
+    """A saved job application as listed in the tracker."""
+    folder: str
+    path: str
+    notes: dict
+    employer: str
+    job_title: str
+    jd_data: dict | None
+    files: frozenset
+
+
+@lru_cache(maxsize=1024)
+def parse_iso_date(value: str):
+    """Parse a stored ISO date for the date widgets; notes keep the raw string."""
+    return datetime.fromisoformat(value).date() if value else None
+
+
+@st.cache_data(show_spinner=False)
+def load_json_file(path: str, mtime_ns: int) -> dict:
+    """Parse a stored JSON file; mtime_ns is part of the key so rewritten files are re-read."""
+    with open(path, 'rb') as f:
+        return json.loads(f.read())
+
+
+def read_json_cached(entries: dict, name: str) -> dict | None:
+    """Parse entries[name] through the mtime-keyed cache, or return None if the folder has no such file."""
+    entry = entries.get(name)
+    if entry is None:
+        return None
+    return load_json_file(entry.path, entry.stat().st_mtime_ns)
+
+
+def read_job_notes(job_path: str) -> dict:
+    """Read a job's notes.json through the mtime-keyed cache; {} when the job has no notes yet."""
+    notes_path = os.path.join(job_path, "notes.json")
+    try:
+        return load_json_file(notes_path, os.stat(notes_path).st_mtime_ns)
+    except FileNotFoundError:
+        return {}
+
+
+def edit_notes(job_folder: str):
+    """Button callback: open the notes editor for a job."""
+    st.session_state.editing_notes_for = job_folder
+
+
+def request_delete(job_folder: str):
+    """Button callback: ask for confirmation before deleting a job."""
+    st.session_state[f"confirm_delete_{job_folder}"] = True
+
+
+def confirm_delete(job_folder: str, job_path: str, employer_name: str):
+    """Button callback: delete the job folder before the tracker is redrawn."""
+    shutil.rmtree(job_path)
+    del st.session_state[f"confirm_delete_{job_folder}"]
+    st.toast(f"Successfully deleted application for {employer_name}.")
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_job_records(output_dir: str, fingerprint: tuple) -> list:
+    """Gather every job's notes and description, sorted by employer then title.
+
+    fingerprint is (folder name, folder mtime_ns) per job; the app writes job files
+    with os.replace, so any save changes it and the records are rebuilt.
+    """
     job_data = []
-    for job_folder in job_folders:
+    for job_folder, _mtime_ns in fingerprint:
         job_path = os.path.join(output_dir, job_folder)
-        notes = get_job_notes(job_path)
+        # List the folder once to learn which notes, JD and PDFs exist
+        with os.scandir(job_path) as it:
+            entries = {entry.name: entry for entry in it}
+        notes = read_json_cached(entries, "notes.json") or {}
         
-        # Get employer name from job description
+        # Load the job description once; the card header and the details expander share it
         employer_name = "Unknown Company"
-        jd_path = os.path.join(job_path, "job_description.json")
-        if os.path.exists(jd_path):
-            try:
-                with open(jd_path, 'r') as f:
-                    jd_data = json.load(f)
+        jd_data = None
+        try:
+            jd_data = read_json_cached(entries, "job_description.json")
+            if jd_data is not None:
                 employer_name = jd_data.get('hiringOrganization', 'Unknown Company')
-            except:
-                pass
+        except Exception:
+            jd_data = None
         
-        job_data.append({
-            'folder': job_folder,
-            'path': job_path,
-            'notes': notes,
-            'employer': employer_name,
-            'job_title': job_folder.replace('_', ' ')
-        })
+        job_data.append(JobRecord(
+            folder=job_folder,
+            path=job_path,
+            notes=notes,
+            employer=employer_name,
+            job_title=job_folder.replace('_', ' '),
+            jd_data=jd_data,
+            files=frozenset(entries)
+        ))
     
     # Sort by employer name, then by job title
-    job_data.sort(key=lambda x: (x['employer'], x['job_title']))
+    job_data.sort(key=attrgetter('employer', 'job_title'))
+    return job_data
+
+
+def rescore_all_jobs(output_dir: str, job_folders: list, generation_agent):
+    """Re-score the current resume against every stored job description in one concurrent pass."""
+    job_descriptions = {}
+    for job_folder in job_folders:
+        jd_path = os.path.join(output_dir, job_folder, "job_description.json")
+        # Folders without a JD (or with a broken one) are skipped; opening directly saves an exists() stat
+        try:
+            with open(jd_path, 'rb') as f:
+                job_descriptions[job_folder] = JobDescription.model_validate_json(f.read())
+        except Exception:
+            continue
+
+    results = generation_agent.score_jobs_parallel(st.session_state.resume, job_descriptions)
+    scored = 0
+    for job_folder, assessment in results.items():
+        if isinstance(assessment, dict) and 'error' not in assessment:
+            job_path = os.path.join(output_dir, job_folder)
+            notes = read_job_notes(job_path)
+            notes["alignment_score"] = assessment.get("alignment_score")
+            save_job_notes(job_path, notes)
+            scored += 1
+    return scored, len(job_descriptions)
+
+
+def render(load_generation_agent=None):
+    """Render the job tracker page with all job applications.
+
+    load_generation_agent builds the AI agent on demand; listing jobs never needs it.
+    """
+    output_dir = OUTPUT_DIR
+    # One directory pass; DirEntry.is_dir() reuses the type from the listing instead of a stat per entry
+    try:
+        with os.scandir(output_dir) as it:
+            folder_entries = [entry for entry in it if entry.is_dir()]
+    except FileNotFoundError:
+        folder_entries = []
+    if not folder_entries:
+        st.info("No job applications have been saved yet. Analyze a job to get started!")
+        return
+
+    job_folders = [entry.name for entry in folder_entries]
+
+    if load_generation_agent is not None:
+        if st.button("🔄 Rescore All", key="rescore_all_jobs", help="Re-score your current resume against every saved job"):
+            if not st.session_state.get("openai_api_key"):
+                st.error("❌ OpenAI API Key is required to rescore jobs. Add it under Settings.")
+            else:
+                with st.spinner(f"Scoring your resume against {len(job_folders)} saved jobs..."):
+                    scored, total = rescore_all_jobs(output_dir, job_folders, load_generation_agent())
+                st.success(f"✓ Rescored {scored} of {total} jobs")
+    
+    # Folder mtimes change whenever a file inside is created, deleted or atomically replaced,
+    # so an unchanged fingerprint means the records can come straight from the cache
+    fingerprint = tuple((entry.name, entry.stat().st_mtime_ns) for entry in folder_entries)
+    job_data = load_job_records(output_dir, fingerprint)
     
     for job_info in job_data:
-        job_folder = job_info['folder']
-        job_path = job_info['path']
-        notes = job_info['notes']
-        employer_name = job_info['employer']
-        job_title = job_info['job_title']
+        job_folder = job_info.folder
+        job_path = job_info.path
+        notes = job_info.notes
+        employer_name = job_info.employer
+        job_title = job_info.job_title
 
         with st.container(border=True):
             # Header with employer and job title
             col1, col2, col3 = st.columns([3, 1, 1])
             with col1:
-                st.markdown(f"### 🏢 {employer_name}")
-                st.markdown(f"**{job_title}**")
-                
                 # Status with color coding
                 status = notes.get("status", "Not Applied")
-                status_colors = {
-                    "Not Applied": "🔵",
-                    "Applied": "🟡", 
-                    "Interviewing": "🟠",
-                    "Offer Received": "🟢",
-                    "Offer Accepted": "✅",
-                    "Closed/Rejected": "🔴"
-                }
-                status_icon = status_colors.get(status, "⚪")
-                st.markdown(f"{status_icon} **Status:** {status}")
+                status_line = STATUS_LINES.get(status) or f"⚪ **Status:** {status}"
+                # Emit the read-only header as one element instead of one per line
+                st.markdown(f"### 🏢 {employer_name}\n\n**{job_title}**\n\n{status_line}")
                 
-                # Show dates if available
+                # Show score and dates if available
+                caption_lines = []
+                if notes.get("alignment_score"):
+                    caption_lines.append(f"🎯 Alignment Score: {notes.get('alignment_score')}")
                 if notes.get("applied_date"):
-                    st.caption(f"📅 Applied: {notes.get('applied_date')}")
+                    caption_lines.append(f"📅 Applied: {notes.get('applied_date')}")
                 if notes.get("closed_date"):
-                    st.caption(f"🏁 Closed: {notes.get('closed_date')}")
+                    caption_lines.append(f"🏁 Closed: {notes.get('closed_date')}")
+                if caption_lines:
+                    st.caption("  \n".join(caption_lines))
 
             with col2:
                 st.markdown("**Actions**")
-                if st.button("📝 Edit Notes", key=f"notes_{job_folder}", use_container_width=True):
-                    st.session_state.editing_notes_for = job_folder
+                st.button("📝 Edit Notes", key=f"notes_{job_folder}", use_container_width=True, on_click=edit_notes, args=(job_folder,))
                 
             with col3:
                 st.markdown("**Manage**")
+                # Callbacks update state before the rerun, so each click costs one tracker pass, not two
                 if st.session_state.get(f"confirm_delete_{job_folder}"):
-                    if st.button("⚠️ Confirm Delete", key=f"confirm_btn_{job_folder}", type="primary", use_container_width=True):
-                        shutil.rmtree(job_path)
-                        st.success(f"Successfully deleted application for {employer_name}.")
-                        del st.session_state[f"confirm_delete_{job_folder}"]
-                        st.rerun()
+                    st.button("⚠️ Confirm Delete", key=f"confirm_btn_{job_folder}", type="primary", use_container_width=True,
+                              on_click=confirm_delete, args=(job_folder, job_path, employer_name))
                 else:
-                    if st.button("🗑️ Delete", key=f"delete_{job_folder}", use_container_width=True):
-                        st.session_state[f"confirm_delete_{job_folder}"] = True
-                        st.rerun()
+                    st.button("🗑️ Delete", key=f"delete_{job_folder}", use_container_width=True,
+                              on_click=request_delete, args=(job_folder,))
 
             with st.expander("View Details & Documents"):
                 # Display Job Description
                 st.markdown("**Job Description**")
-                jd_path = os.path.join(job_path, "job_description.json")
-                if os.path.exists(jd_path):
-                    with open(jd_path, 'r') as f:
-                        jd_data = json.load(f)
-                    
-                    st.markdown(f"**Company:** {jd_data.get('hiringOrganization', 'N/A')}")
-                    st.markdown(f"**Location:** {jd_data.get('jobLocation', 'N/A')}")
+                jd_data = job_info.jd_data
+                if jd_data is not None:
+                    # Collect the read-only details and render them in a single markdown call
+                    jd_lines = [
+                        f"**Company:** {jd_data.get('hiringOrganization', 'N/A')}",
+                        f"**Location:** {jd_data.get('jobLocation', 'N/A')}",
+                    ]
                     if jd_data.get('url'):
-                        st.markdown(f"[View Original Posting]({jd_data.get('url')})")
+                        jd_lines.append(f"[View Original Posting]({jd_data.get('url')})")
                     
                     if jd_data.get('description'):
-                        st.markdown(f"**Description:**\n{jd_data.get('description')}")
+                        jd_lines.append(f"**Description:**\n{jd_data.get('description')}")
 
                     if jd_data.get('responsibilities'):
-                        st.markdown("**Responsibilities:**")
-                        for resp in jd_data.get('responsibilities'):
-                            st.markdown(f"- {resp}")
+                        jd_lines.append("**Responsibilities:**\n" + "\n".join(f"- {resp}" for resp in jd_data.get('responsibilities')))
 
                     if jd_data.get('qualifications'):
-                        st.markdown("**Qualifications:**")
-                        for qual in jd_data.get('qualifications'):
-                            st.markdown(f"- {qual}")
+                        jd_lines.append("**Qualifications:**\n" + "\n".join(f"- {qual}" for qual in jd_data.get('qualifications')))
+
+                    st.markdown("\n\n".join(jd_lines))
                 else:
                     st.warning("Job description file not found.")
 
                 # Display Document Links
-                st.markdown("**Generated Documents**")
-                doc_col1, doc_col2 = st.columns(2)
-                resume_pdf_path = os.path.join(job_path, "resume.pdf")
-                cover_letter_pdf_path = os.path.join(job_path, "cover_letter.pdf")
-
-                if os.path.exists(resume_pdf_path):
-                    with open(resume_pdf_path, "rb") as f:
-                        doc_col1.download_button("📄 Download Resume PDF", f.read(), file_name="resume.pdf", use_container_width=True)
-                else:
-                    doc_col1.button("📄 Resume PDF Not Found", disabled=True, use_container_width=True)
-                
-                if os.path.exists(cover_letter_pdf_path):
-                    with open(cover_letter_pdf_path, "rb") as f:
-                        doc_col2.download_button("✉️ Download Cover Letter PDF", f.read(), file_name="cover_letter.pdf", use_container_width=True)
-                else:
-                    doc_col2.button("✉️ Cover Letter PDF Not Found", disabled=True, use_container_width=True)
+                render_documents(job_folder, job_path, job_info.files)
 
     # --- Notes Editing Modal ---
-    if 'editing_notes_for' in st.session_state and st.session_state.editing_notes_for:
-        job_folder = st.session_state.editing_notes_for
-        job_path = os.path.join(output_dir, job_folder)
-        notes = get_job_notes(job_path)
-
-        with st.form(key=f"notes_form_{job_folder}"):
-            st.subheader(f"Editing Notes for: {job_folder.replace('_', ' ')}")
-            
-            status_options = ["Not Applied", "Applied", "Interviewing", "Offer Received", "Offer Accepted", "Closed/Rejected"]
-            current_status = notes.get("status", "Not Applied")
-            new_status = st.selectbox("Application Status", options=status_options, index=status_options.index(current_status))
-
-            applied_date = st.date_input("Date Applied", value=None if not notes.get("applied_date") else datetime.fromisoformat(notes.get("applied_date")))
-            closed_date = st.date_input("Date Closed", value=None if not notes.get("closed_date") else datetime.fromisoformat(notes.get("closed_date")))
-            comments = st.text_area("Comments", value=notes.get("comments", ""))
-
-            submitted = st.form_submit_button("Save Notes")
-            if submitted:
-                updated_notes = {
-                    "status": new_status,
-                    "applied_date": applied_date.isoformat() if applied_date else None,
-                    "closed_date": closed_date.isoformat() if closed_date else None,
-                    "comments": comments
-                }
-                save_job_notes(job_path, updated_notes)
-                st.success("Notes saved!")
-                st.session_state.editing_notes_for = None
+    render_notes_editor(output_dir)
+
+
+@st.fragment
+def render_documents(job_folder: str, job_path: str, files: frozenset):
+    """Render the PDF downloads; the files are only read once the user asks for them."""
+    st.markdown("**Generated Documents**")
+    # Reading every PDF on every rerun is wasted work for cards nobody downloads from
+    if not st.toggle("Show downloads", key=f"docs_{job_folder}"):
+        return
+    doc_col1, doc_col2 = st.columns(2)
+
+    if "resume.pdf" in files:
+        with open(os.path.join(job_path, "resume.pdf"), "rb") as f:
+            doc_col1.download_button("📄 Download Resume PDF", f.read(), file_name="resume.pdf", use_container_width=True)
+    else:
+        doc_col1.button("📄 Resume PDF Not Found", disabled=True, use_container_width=True)
+    
+    if "cover_letter.pdf" in files:
+        with open(os.path.join(job_path, "cover_letter.pdf"), "rb") as f:
+            doc_col2.download_button("✉️ Download Cover Letter PDF", f.read(), file_name="cover_letter.pdf", use_container_width=True)
+    else:
+        doc_col2.button("✉️ Cover Letter PDF Not Found", disabled=True, use_container_width=True)
+
+
+@st.fragment
+def render_notes_editor(output_dir: str):
+    """Render the notes form; saving reruns only this fragment, not the whole tracker."""
+    job_folder = st.session_state.get('editing_notes_for')
+    if not job_folder:
+        return
+    job_path = os.path.join(output_dir, job_folder)
+    notes = read_job_notes(job_path)
+
+    with st.form(key=f"notes_form_{job_folder}"):
+        st.subheader(f"Editing Notes for: {job_folder.replace('_', ' ')}")
+        
+        current_status = notes.get("status", "Not Applied")
+        new_status = st.selectbox("Application Status", options=STATUS_OPTIONS, index=STATUS_INDEX.get(current_status, 0))
+
+        applied_date = st.date_input("Date Applied", value=parse_iso_date(notes.get("applied_date")))
+        closed_date = st.date_input("Date Closed", value=parse_iso_date(notes.get("closed_date")))
+        comments = st.text_area("Comments", value=notes.get("comments", ""))
+
+        submitted = st.form_submit_button("Save Notes")
+        if submitted:
+            updated_notes = {
+                "status": new_status,
+                "applied_date": applied_date.isoformat() if applied_date else None,
+                "closed_date": closed_date.isoformat() if closed_date else None,
+                "comments": comments
+            }
+            # Keep the last rescore result when editing notes
+            if notes.get("alignment_score"):
+                updated_notes["alignment_score"] = notes["alignment_score"]
+            save_job_notes(job_path, updated_notes)
+            st.toast("Notes saved!")
+            st.session_state.editing_notes_for = None
+            # Status and dates are shown on the job cards outside this fragment,
+            # so changing them needs a full rerun; a comment-only edit just closes the form
+            if any(updated_notes[field] != notes.get(field) for field in ("status", "applied_date", "closed_date")):
                 st.rerun()
+            st.rerun(scope="fragment")
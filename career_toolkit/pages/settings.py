@@ -2,10 +2,13 @@
 
 import os
 import json
+import hashlib
 import streamlit as st
-from agents.data_agent import Resume
+from utils.file_helpers import write_file_atomic
+from utils.session_state import parse_resume, mark_resume_changed, get_resume_preview, SIGNATURE_EXTENSIONS, USER_ASSETS_DIR, RESUME_PATH, CONFIG_PATH
 
-USER_ASSETS_DIR = "career_toolkit/user_assets"
+# Uploads above this are rejected before they are hashed, parsed or copied into session state
+MAX_RESUME_UPLOAD_BYTES = 1_000_000
 
 
 def render():
@@ -26,6 +29,23 @@ def render():
         render_signature_settings()
 
 
+def save_preferred_model(model: str):
+    """Persist the model choice; load_agents is keyed on it, so no cache clearing is needed."""
+    # Re-selecting the active model is a no-op
+    if model == st.session_state.preferred_model:
+        return
+    st.session_state.preferred_model = model
+    write_file_atomic(CONFIG_PATH, json.dumps({"preferred_model": model}))
+
+
+def render_model_card(title: str, description: str, badge: str, badge_color: str, best_for: str, selected: bool):
+    """Render one model card; st.html skips the markdown pipeline for this static HTML."""
+    border_color = "var(--primary-color)" if selected else "var(--border-color)"
+    bg_color = "rgba(99, 102, 241, 0.1)" if selected else "var(--background-secondary)"
+    st.html(f'<div style="background: {bg_color}; padding: 1.5rem; border-radius: 10px; border: 2px solid {border_color}; height: 100%; cursor: pointer;"><div style="font-size: 1.2rem; color: var(--text-primary); font-weight: 600; margin-bottom: 0.5rem;">{title}</div><div style="color: var(--text-secondary); font-size: 0.9rem; line-height: 1.5; margin-bottom: 1rem;">{description}</div><div style="color: {badge_color}; font-weight: 500;">{badge}</div><div style="color: var(--text-muted); font-size: 0.85rem; margin-top: 0.5rem;">Best for: {best_for}</div></div>')
+
+
+@st.fragment
 def render_model_settings():
     """Render AI model selection settings."""
     model_options = {
@@ -38,43 +58,47 @@ def render_model_settings():
     
     with col1:
         is_mini_selected = st.session_state.preferred_model == "gpt-4o-mini"
-        border_color = "var(--primary-color)" if is_mini_selected else "var(--border-color)"
-        bg_color = "rgba(99, 102, 241, 0.1)" if is_mini_selected else "var(--background-secondary)"
-        
-        st.markdown(f'<div style="background: {bg_color}; padding: 1.5rem; border-radius: 10px; border: 2px solid {border_color}; height: 100%; cursor: pointer;"><div style="font-size: 1.2rem; color: var(--text-primary); font-weight: 600; margin-bottom: 0.5rem;">⚡ GPT-4o Mini</div><div style="color: var(--text-secondary); font-size: 0.9rem; line-height: 1.5; margin-bottom: 1rem;">Fast and cost-effective model ideal for most tasks. 3x faster and 10x cheaper than premium models.</div><div style="color: var(--success-color); font-weight: 500;">✓ Recommended for daily use</div><div style="color: var(--text-muted); font-size: 0.85rem; margin-top: 0.5rem;">Best for: Resume optimization, keyword analysis, cover letters</div></div>', unsafe_allow_html=True)
+        render_model_card(
+            "⚡ GPT-4o Mini",
+            "Fast and cost-effective model ideal for most tasks. 3x faster and 10x cheaper than premium models.",
+            "✓ Recommended for daily use",
+            "var(--success-color)",
+            "Resume optimization, keyword analysis, cover letters",
+            is_mini_selected
+        )
         
         if st.button("Select GPT-4o Mini", key="select_mini_modal", use_container_width=True, type="primary" if is_mini_selected else "secondary"):
-            st.session_state.preferred_model = "gpt-4o-mini"
-            # Save preference to config file
-            config_path = os.path.join(USER_ASSETS_DIR, "config.json")
-            with open(config_path, 'w') as f:
-                json.dump({"preferred_model": "gpt-4o-mini"}, f)
-            # Clear cache to reload agents with new model
-            st.cache_resource.clear()
+            save_preferred_model("gpt-4o-mini")
             st.success("✓ Model updated to GPT-4o Mini")
     
     with col2:
         is_gpt5_selected = st.session_state.preferred_model == "gpt-5"
-        border_color = "var(--primary-color)" if is_gpt5_selected else "var(--border-color)"
-        bg_color = "rgba(99, 102, 241, 0.1)" if is_gpt5_selected else "var(--background-secondary)"
-        
-        st.markdown(f'<div style="background: {bg_color}; padding: 1.5rem; border-radius: 10px; border: 2px solid {border_color}; height: 100%; cursor: pointer;"><div style="font-size: 1.2rem; color: var(--text-primary); font-weight: 600; margin-bottom: 0.5rem;">🧠 GPT-5</div><div style="color: var(--text-secondary); font-size: 0.9rem; line-height: 1.5; margin-bottom: 1rem;">Advanced reasoning model with superior analysis capabilities. Best for complex career decisions.</div><div style="color: var(--warning-color); font-weight: 500;">⚠ Premium pricing</div><div style="color: var(--text-muted); font-size: 0.85rem; margin-top: 0.5rem;">Best for: Complex analysis, strategic career planning</div></div>', unsafe_allow_html=True)
+        render_model_card(
+            "🧠 GPT-5",
+            "Advanced reasoning model with superior analysis capabilities. Best for complex career decisions.",
+            "⚠ Premium pricing",
+            "var(--warning-color)",
+            "Complex analysis, strategic career planning",
+            is_gpt5_selected
+        )
         
         if st.button("Select GPT-5", key="select_gpt5_modal", use_container_width=True, type="primary" if is_gpt5_selected else "secondary"):
-            st.session_state.preferred_model = "gpt-5"
-            # Save preference to config file
-            config_path = os.path.join(USER_ASSETS_DIR, "config.json")
-            with open(config_path, 'w') as f:
-                json.dump({"preferred_model": "gpt-5"}, f)
-            # Clear cache to reload agents with new model
-            st.cache_resource.clear()
+            save_preferred_model("gpt-5")
             st.success("✓ Model updated to GPT-5")
     
     # Show current selection
     current_model_display = model_options[st.session_state.preferred_model]
     st.info(f"🤖 **Current Model:** {current_model_display}")
 
+    st.session_state.bypass_llm_cache = st.toggle(
+        "Bypass response cache",
+        value=st.session_state.get("bypass_llm_cache", False),
+        key="bypass_llm_cache_toggle",
+        help="Identical AI requests are answered from a local cache. Turn this on to always request fresh responses."
+    )
+
 
+@st.fragment
 def render_api_key_settings():
     """Render API key configuration."""
     st.markdown("### Configure your OpenAI API Key")
@@ -88,9 +112,8 @@ def render_api_key_settings():
     )
     
     if new_api_key != st.session_state.openai_api_key:
+        # load_agents is keyed on the API key, so the next run builds fresh agents
         st.session_state.openai_api_key = new_api_key
-        # Clear cache to reload agents with new API key
-        st.cache_resource.clear()
         if new_api_key:
             st.success("✓ API Key updated successfully")
         else:
@@ -104,44 +127,55 @@ def render_api_key_settings():
     st.info("💡 **Tip:** You can get your API key from [OpenAI Platform](https://platform.openai.com/api-keys)")
 
 
+@st.fragment
 def render_resume_settings():
     """Render resume upload settings."""
     resume_uploader = st.file_uploader("Upload your JSON Resume", type="json", key="resume_uploader_modal")
-    if resume_uploader is not None:
+    if resume_uploader is not None and resume_uploader.size > MAX_RESUME_UPLOAD_BYTES:
+        st.error(f"❌ Resume file is too large ({resume_uploader.size // 1024:,} KB). JSON resumes are usually a few KB.")
+    elif resume_uploader is not None:
         try:
-            resume_content = resume_uploader.read().decode('utf-8')
-            # Save to session state
-            st.session_state.resume = Resume.model_validate_json(resume_content)
-            # Save persistently
-            with open(os.path.join(USER_ASSETS_DIR, "resume.json"), "w") as f:
-                f.write(resume_content)
-            st.success("✓ Resume updated and saved successfully!")
+            resume_bytes = resume_uploader.getvalue()
+            resume_sha = hashlib.sha256(resume_bytes).hexdigest()
+            # The uploader keeps its file across reruns; only a new upload replaces the resume
+            if resume_sha != st.session_state.get('resume_sha'):
+                st.session_state.resume = parse_resume(resume_sha, resume_bytes)
+                st.session_state.resume_sha = resume_sha
+                mark_resume_changed()
+                # Save persistently in canonical form: no BOM or stray whitespace, null fields dropped
+                write_file_atomic(RESUME_PATH, st.session_state.resume.model_dump_json(exclude_none=True))
+                st.success("✓ Resume updated and saved successfully!")
         except Exception as e:
             st.error(f"❌ Invalid resume format: {e}")
     
     with st.expander("📄 View Current Resume", expanded=False):
-        st.json(st.session_state.resume.model_dump_json(indent=2, exclude_none=True))
+        st.json(get_resume_preview())
 
 
+@st.fragment
 def render_signature_settings():
     """Render signature upload settings."""
     signature_uploader = st.file_uploader("Upload your signature image (PNG, JPG, SVG)", type=["png", "jpg", "jpeg", "svg"], key="signature_uploader_modal")
-    if signature_uploader is not None:
-        # Clear any old signature files first
-        if os.path.exists(USER_ASSETS_DIR):
-            for f in os.listdir(USER_ASSETS_DIR):
-                if f.lower().endswith(('.png', '.jpg', '.jpeg', '.svg')):
-                    os.remove(os.path.join(USER_ASSETS_DIR, f))
+    # The uploader keeps its file across reruns; only a new upload replaces the signature
+    if signature_uploader is not None and signature_uploader.file_id != st.session_state.get('signature_upload_id'):
+        # Clear any old signature files first in a single directory pass; the folder may not exist yet
+        os.makedirs(USER_ASSETS_DIR, exist_ok=True)
+        with os.scandir(USER_ASSETS_DIR) as entries:
+            for entry in entries:
+                if os.path.splitext(entry.name)[1].lower() in SIGNATURE_EXTENSIONS:
+                    os.remove(entry.path)
 
         # Save new signature with its original name
-        st.session_state.signature_content = signature_uploader.read()
+        signature_path = os.path.join(USER_ASSETS_DIR, signature_uploader.name)
+        with open(signature_path, "wb") as f:
+            f.write(signature_uploader.getvalue())
+        st.session_state.signature_path = signature_path
         st.session_state.signature_filename = signature_uploader.name
-        with open(os.path.join(USER_ASSETS_DIR, signature_uploader.name), "wb") as f:
-            f.write(st.session_state.signature_content)
+        st.session_state.signature_upload_id = signature_uploader.file_id
         st.success(f"✓ Signature '{signature_uploader.name}' uploaded and saved!")
     
-    if st.session_state.signature_content:
+    if st.session_state.signature_path:
         st.markdown("**Current Signature:**")
-        st.image(st.session_state.signature_content, width=300)
+        st.image(st.session_state.signature_path, width=300)
     else:
         st.info("💡 No custom signature loaded. The cover letter will have a blank space for a signature.")
@@ -3,36 +3,42 @@
 import streamlit as st
 
 
+def navigate_to(page: str, step: str = None):
+    """Button callback: switch page/step before the script runs, so a click costs one run, not two."""
+    step = step or st.session_state.step
+    if st.session_state.current_page == page and st.session_state.step == step:
+        return
+    st.session_state.current_page = page
+    st.session_state.step = step
+    # Mirror the view into the URL so it survives reloads and can be bookmarked
+    st.query_params["page"] = "settings" if step == "settings" else page
+
+
+def open_job_coach():
+    """Button callback: return to the coach workflow, leaving Settings for the first step."""
+    step = "enter_jd" if st.session_state.step == "settings" else st.session_state.step
+    navigate_to("main_app", step)
+
+
 def render_top_nav():
     """Render the top navigation bar with Streamlit columns and buttons."""
     
-    # Create navigation bar container
-    st.markdown('<div class="nav-bar-container">', unsafe_allow_html=True)
-    
-    # Create columns: logo on left, spacer, then nav items on right
-    logo_col, spacer, nav1, nav2, nav3 = st.columns([3, 4, 1.5, 1.5, 1.5])
-    
-    # Logo
-    with logo_col:
-        st.markdown('<div class="nav-logo">🤖 AI Job Coach</div>', unsafe_allow_html=True)
-    
-    # Navigation buttons on the right
-    with nav1:
-        if st.button("🎯 Job Coach", key="btn_coach"):
-            st.session_state.current_page = "main_app"
-            if st.session_state.step == "settings":
-                st.session_state.step = "enter_jd"
-            st.rerun()
-    
-    with nav2:
-        if st.button("📈 Job Tracker", key="btn_tracker"):
-            st.session_state.current_page = "job_tracker"
-            st.rerun()
-    
-    with nav3:
-        if st.button("⚙️ Settings", key="btn_settings"):
-            st.session_state.step = "settings"
-            st.session_state.current_page = "main_app"
-            st.rerun()
-    
-    st.markdown('</div>', unsafe_allow_html=True)
+    # The key gives the container an st-key-nav_bar class for the theme to style;
+    # markdown <div> wrappers never actually enclosed the columns
+    with st.container(key="nav_bar"):
+        # Create columns: logo on left, spacer, then nav items on right
+        logo_col, spacer, nav1, nav2, nav3 = st.columns([3, 4, 1.5, 1.5, 1.5])
+        
+        # Logo
+        with logo_col:
+            st.html('<div class="nav-logo">🤖 AI Job Coach</div>')
+        
+        # Navigation buttons on the right
+        with nav1:
+            st.button("🎯 Job Coach", key="btn_coach", on_click=open_job_coach)
+        
+        with nav2:
+            st.button("📈 Job Tracker", key="btn_tracker", on_click=navigate_to, args=("job_tracker",))
+        
+        with nav3:
+            st.button("⚙️ Settings", key="btn_settings", on_click=navigate_to, args=("main_app", "settings"))
@@ -1,20 +1,67 @@
 """File operation helpers for job tracking and asset management."""
 
 import os
+import re
 import json
+import shutil
+import threading
+from functools import lru_cache
 
 
-def get_job_notes(job_folder_path: str) -> dict:
-    """Read the notes.json file for a given job."""
-    notes_path = os.path.join(job_folder_path, "notes.json")
-    if os.path.exists(notes_path):
-        with open(notes_path, 'r') as f:
-            return json.load(f)
-    return {}
+OUTPUT_DIR = "output"
+
+# Everything except word characters and spaces, matching the old isalnum()/' '/'_' filter
+_UNSAFE_TITLE_CHARS = re.compile(r"[^\w ]+")
+
+
+def write_file_atomic(path: str, content: str):
+    """Write content to a temp file beside path and swap it in, so readers never see a partial file."""
+    # Unique per writer, so two sessions saving the same file never share a half-written temp file
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
 
 
 def save_job_notes(job_folder_path: str, notes: dict):
     """Save the notes dictionary to notes.json."""
     notes_path = os.path.join(job_folder_path, "notes.json")
-    with open(notes_path, 'w') as f:
-        json.dump(notes, f, indent=2)
+    # Serialize first so the file gets one write instead of one per JSON token
+    write_file_atomic(notes_path, json.dumps(notes, indent=2))
+
+
+def create_job_notes(job_folder_path: str, notes: dict) -> bool:
+    """Write notes.json only if it doesn't exist yet; returns False when notes were already there."""
+    notes_path = os.path.join(job_folder_path, "notes.json")
+    try:
+        with open(notes_path, 'x') as f:
+            f.write(json.dumps(notes, indent=2))
+    except FileExistsError:
+        return False
+    return True
+
+
+@lru_cache(maxsize=256)
+def job_output_folder(job_title: str) -> str:
+    """Return the output folder for a job title, stripped of characters unsafe in folder names."""
+    sanitized_title = _UNSAFE_TITLE_CHARS.sub("", job_title or "Untitled Job").rstrip()
+    return os.path.join(OUTPUT_DIR, sanitized_title)
+
+
+def sync_file(src: str, dst: str, link: bool = False):
+    """Copy src to dst unless dst is already at least as new; copyfile uses sendfile on Linux.
+
+    With link=True a missing dst is hardlinked to src instead, for read-only files like templates.
+    """
+    try:
+        if os.stat(dst).st_mtime_ns >= os.stat(src).st_mtime_ns:
+            return
+    except FileNotFoundError:
+        if link:
+            try:
+                os.link(src, dst)
+                return
+            except OSError:
+                # Cross-device or no hardlink support; fall back to a copy
+                pass
+    shutil.copyfile(src, dst)
@@ -2,92 +2,185 @@
 
 import os
 import json
+import hashlib
 import streamlit as st
 from agents.data_agent import Resume, JobDescription
 
 
 USER_ASSETS_DIR = "career_toolkit/user_assets"
+RESUME_PATH = os.path.join(USER_ASSETS_DIR, "resume.json")
+CONFIG_PATH = os.path.join(USER_ASSETS_DIR, "config.json")
+BACKUP_RESUME_PATH = "career_toolkit/backup_resume.json"
+
+# Resolved once per process rather than on every session bootstrap
+_ENV_OPENAI_KEY = os.getenv("OPENAI_API_KEY", "")
+
+SESSION_DEFAULTS = {
+    'job_description': JobDescription,
+    'openai_api_key': lambda: _ENV_OPENAI_KEY,
+    # Lowercased names of AI-inferred items, frozen so the views can test membership directly
+    'added_skills': frozenset,
+    'added_qualifications': frozenset,
+    'added_experience_requirements': frozenset,
+    'cover_letter': str,
+    'recipient_name': lambda: "Hiring Team",
+    'recipient_title': lambda: "Talent Acquisition",
+    'company_address': str,
+    'current_page': lambda: "main_app",  # Default page
+    'analysis_results': lambda: None,
+    'preferred_model': lambda: "gpt-4o-mini",  # Default to fast model
+    'show_settings_modal': lambda: False,
+    'resume_version': lambda: 0,
+    'signature_path': str,
+    'signature_filename': str,
+}
+SIGNATURE_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.svg'})
+# Steps the app can render; anything else (e.g. stale session state) falls back to the first step
+VALID_STEPS = frozenset({"enter_jd", "jd_processed", "skill_gap", "cover_letter", "settings"})
+
+
+@st.cache_data(show_spinner=False)
+def parse_resume(sha: str, _raw: bytes) -> Resume:
+    """Parse resume JSON once per content hash; returns a per-session copy."""
+    return Resume.model_validate_json(_raw)
+
+
+def read_resume_file(path: str) -> tuple:
+    """Read a resume file through the hash-keyed parse cache; returns (resume, sha)."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    sha = hashlib.sha256(raw).hexdigest()
+    return parse_resume(sha, raw), sha
+
+
+def assets_fingerprint() -> tuple:
+    """(name, mtime_ns, size) of every asset file; changes whenever an asset is rewritten."""
+    fingerprint = []
+    try:
+        with os.scandir(USER_ASSETS_DIR) as entries:
+            for entry in entries:
+                stat = entry.stat()
+                fingerprint.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    except FileNotFoundError:
+        # First run: create the folder here instead of probing for it on every call
+        os.makedirs(USER_ASSETS_DIR, exist_ok=True)
+    return tuple(sorted(fingerprint))
+
+
+@st.cache_data(show_spinner=False)
+def load_user_assets(fingerprint: tuple) -> dict:
+    """Load resume, signature and preferences in one pass; cached until an asset file changes."""
+    assets = {
+        "resume": Resume(),
+        "resume_sha": None,
+        "has_resume_file": False,
+        "signature_path": "",
+        "signature_filename": "",
+        "preferred_model": None,
+    }
+
+    # The fingerprint already lists the directory, so no per-file existence checks are needed
+    names = {name for name, _mtime, _size in fingerprint}
+
+    # Load Resume
+    if os.path.basename(RESUME_PATH) in names:
+        assets["resume"], assets["resume_sha"] = read_resume_file(RESUME_PATH)
+        assets["has_resume_file"] = True
+    else:
+        # Fallback to backup resume
+        try:
+            assets["resume"], assets["resume_sha"] = read_resume_file(BACKUP_RESUME_PATH)
+        except (FileNotFoundError, Exception):
+            pass
+
+    # Load Signature (first one found)
+    for name, _mtime, _size in fingerprint:
+        if os.path.splitext(name)[1].lower() in SIGNATURE_EXTENSIONS:
+            # Only the path is kept; the image is read when a preview or PDF needs it
+            assets["signature_path"] = os.path.join(USER_ASSETS_DIR, name)
+            assets["signature_filename"] = name
+            break
+
+    # Load user preferences
+    if os.path.basename(CONFIG_PATH) in names:
+        try:
+            with open(CONFIG_PATH, 'r') as f:
+                config = json.load(f)
+                assets["preferred_model"] = config.get('preferred_model', 'gpt-4o-mini')
+        except Exception:
+            pass
+
+    return assets
+
+
+def mark_resume_changed():
+    """Bump the resume version; call after editing or replacing the resume."""
+    st.session_state.resume_version = st.session_state.get('resume_version', 0) + 1
+
+
+def get_resume_json() -> str:
+    """Return the resume as indented JSON, reusing the last serialization until the resume changes."""
+    version = st.session_state.get('resume_version', 0)
+    if st.session_state.get('_resume_json_version') != version:
+        st.session_state._resume_json_str = st.session_state.resume.model_dump_json(indent=2)
+        st.session_state._resume_json_version = version
+    return st.session_state._resume_json_str
+
+
+def get_resume_preview() -> dict:
+    """Return the resume as a JSON-ready dict without empty fields, rebuilt only when the resume changes."""
+    version = st.session_state.get('resume_version', 0)
+    if st.session_state.get('_resume_preview_version') != version:
+        st.session_state._resume_preview = st.session_state.resume.model_dump(mode="json", exclude_none=True)
+        st.session_state._resume_preview_version = version
+    return st.session_state._resume_preview
+
+
+def _current_assets() -> dict:
+    """Return the cached contents of the assets directory, creating it on first run."""
+    return load_user_assets(assets_fingerprint())
 
 
 def initialize_session_state():
     """Initialize session state variables and load persistent assets."""
-    # Load persistent assets if they exist
+    # Load persistent assets once per session; the loader itself is shared across sessions
+    assets = None
     if 'assets_loaded' not in st.session_state:
-        os.makedirs(USER_ASSETS_DIR, exist_ok=True)
-        
-        # Load Resume
-        resume_path = os.path.join(USER_ASSETS_DIR, "resume.json")
-        if os.path.exists(resume_path):
-            with open(resume_path, 'r') as f:
-                st.session_state.resume = Resume.model_validate_json(f.read())
-        else:
-            # Fallback to backup resume
-            try:
-                with open("career_toolkit/backup_resume.json", 'r') as f:
-                    st.session_state.resume = Resume.model_validate_json(f.read())
-            except (FileNotFoundError, Exception):
-                st.session_state.resume = Resume()
-        
-        # Load Signature
-        st.session_state.signature_content = None
-        st.session_state.signature_filename = ""
-        if os.path.exists(USER_ASSETS_DIR):
-            for f in os.listdir(USER_ASSETS_DIR):
-                if f.lower().endswith(('.png', '.jpg', '.jpeg', '.svg')):
-                    sig_path = os.path.join(USER_ASSETS_DIR, f)
-                    with open(sig_path, "rb") as file:
-                        st.session_state.signature_content = file.read()
-                    st.session_state.signature_filename = f
-                    break  # Load the first one found
-        
-        # Load user preferences
-        config_path = os.path.join(USER_ASSETS_DIR, "config.json")
-        if os.path.exists(config_path):
-            try:
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
-                    st.session_state.preferred_model = config.get('preferred_model', 'gpt-4o-mini')
-            except Exception:
-                pass
+        assets = _current_assets()
+
+        st.session_state.resume = assets["resume"]
+        st.session_state.resume_sha = assets["resume_sha"]
+        st.session_state.signature_path = assets["signature_path"]
+        st.session_state.signature_filename = assets["signature_filename"]
+        if assets["preferred_model"]:
+            st.session_state.preferred_model = assets["preferred_model"]
         
         st.session_state.assets_loaded = True
 
+    # Restore the view from the URL (?page=...) so reloads and bookmarks land on the same page
+    url_page = st.query_params.get("page")
+    if 'current_page' not in st.session_state and url_page == "job_tracker":
+        st.session_state.current_page = "job_tracker"
+    if 'step' not in st.session_state and url_page == "settings":
+        st.session_state.step = "settings"
+
     # Set initial step based on whether assets are present
     if 'step' not in st.session_state:
-        has_resume_file = os.path.exists(os.path.join(USER_ASSETS_DIR, "resume.json"))
-        has_signature_file = False
-        if os.path.exists(USER_ASSETS_DIR):
-            for f in os.listdir(USER_ASSETS_DIR):
-                if f.lower().endswith((".png", ".jpg", ".jpeg", ".svg")):
-                    has_signature_file = True
-                    break
+        if assets is None:
+            assets = _current_assets()
+        has_resume_file = assets["has_resume_file"]
+        has_signature_file = bool(assets["signature_filename"])
 
         # If either a resume or a signature exists, don't start on Settings
         if has_resume_file or has_signature_file:
             st.session_state.step = "enter_jd"
         else:
             st.session_state.step = "settings"
+    elif st.session_state.step not in VALID_STEPS:
+        # Normalized before anything renders, so the header and tracker agree with the page
+        st.session_state.step = "enter_jd"
 
-    # Initialize other session state variables
-    if 'job_description' not in st.session_state:
-        st.session_state.job_description = JobDescription()
-    if 'openai_api_key' not in st.session_state:
-        st.session_state.openai_api_key = os.getenv("OPENAI_API_KEY", "")
-    if 'added_skills' not in st.session_state:
-        st.session_state.added_skills = []
-    if 'cover_letter' not in st.session_state:
-        st.session_state.cover_letter = ""
-    if 'recipient_name' not in st.session_state:
-        st.session_state.recipient_name = "Hiring Team"
-    if 'recipient_title' not in st.session_state:
-        st.session_state.recipient_title = "Talent Acquisition"
-    if 'company_address' not in st.session_state:
-        st.session_state.company_address = ""
-    if 'current_page' not in st.session_state:
-        st.session_state.current_page = "main_app"  # Default page
-    if 'analysis_results' not in st.session_state:
-        st.session_state.analysis_results = None
-    if 'preferred_model' not in st.session_state:
-        st.session_state.preferred_model = "gpt-4o-mini"  # Default to fast model
-    if 'show_settings_modal' not in st.session_state:
-        st.session_state.show_settings_modal = False
+    # Initialize other session state variables; factories keep unused defaults unbuilt
+    for key, factory in SESSION_DEFAULTS.items():
+        if key not in st.session_state:
+            st.session_state[key] = factory()